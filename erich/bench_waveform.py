@@ -0,0 +1,66 @@
+#BENCHMARK - pulse waveform painting
+#Paints PulseWaveform into an offscreen image frame after frame, advancing the
+#phase like its animation timer does, and reports CPU per frame for the
+#vectorized paint (one drawLines call) and for the old per-pixel
+#math.sin/drawLine loop, at the panel size and at a desktop size.
+#
+#   QT_QPA_PLATFORM=offscreen python erich/bench_waveform.py --frames 500
+
+import argparse
+import math
+import time
+from PyQt5.QtGui import QImage, QPainter, QPen
+from PyQt5.QtWidgets import QApplication
+from erich_test_1 import PulseWaveform
+
+SIZES = [(128, 40), (800, 200)]
+
+
+class LegacyWaveform(PulseWaveform):
+    # the paintEvent this module replaced, kept for comparison
+    def paintEvent(self, event):
+        w, h = self.width(), self.height()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        pen = QPen(self.color, max(2, h // 10))
+        painter.setPen(pen)
+        mid = h // 2
+        points = []
+        for x in range(w):
+            t = (x / w) * 2 * math.pi + self.phase
+            y = mid + math.sin(t) * (h * 0.25) + math.sin(t * 4) * (h * 0.08)
+            points.append((x, int(y)))
+        for i in range(1, len(points)):
+            painter.drawLine(points[i - 1][0], points[i - 1][1], points[i][0], points[i][1])
+
+
+def measure(cls, size, frames):
+    widget = cls()
+    widget.timer.stop()
+    widget.resize(*size)
+    image = QImage(size[0], size[1], QImage.Format_RGB32)
+    widget.render(image)  # first paint builds any cached geometry
+    start = time.process_time()
+    for _ in range(frames):
+        widget.animate()
+        widget.render(image)
+    return (time.process_time() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU per PulseWaveform frame, one drawLines call vs per-pixel lines")
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    # at 25 fps, ms per frame * 2.5 is the percent of one core
+    print(f"{'size':>9} {'old ms':>8} {'new ms':>8} {'speedup':>8} {'old cpu':>8} {'new cpu':>8}")
+    for size in SIZES:
+        old = measure(LegacyWaveform, size, args.frames)
+        new = measure(PulseWaveform, size, args.frames)
+        print(f"{size[0]:>4}x{size[1]:<4} {old:>8.3f} {new:>8.3f} {old / new:>7.1f}x {old * 2.5:>7.1f}% {new * 2.5:>7.1f}%")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import sys
+import os
 import math
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QLabel, QHBoxLayout, QVBoxLayout, QPushButton, QDialog, QListWidget, QMessageBox
+    QApplication, QWidget, QLabel, QHBoxLayout, QVBoxLayout, QPushButton, QDialog, QListWidget
 )
-from PyQt5.QtCore import Qt, QTimer, QTime, QDate, QSize, QPointF
-from PyQt5.QtGui import QFont, QIcon, QPainter, QPixmap, QColor, QPainterPath, QPen
+from PyQt5.QtCore import Qt, QTimer, QTime, QDate, QSize, QPoint, QPointF
+from PyQt5.QtGui import QFont, QPainter, QColor, QPainterPath, QPen
+import numpy as np
+import icons
+
+# readings go into the vitals store the voice assistant reads ("what's my pulse")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "vox"))
+from vitals_store import VITALS_PATH, VitalsStore
 
 
 class PulseWaveform(QWidget):
@@ -12,6 +19,13 @@ class PulseWaveform(QWidget):
         super().__init__(parent)
         self.phase = 0
         self.color = color
+        # per-size geometry, rebuilt only when the widget is resized
+        self._size = None
+        self._pen = None
+        self._points = None
+        self._pairs = None
+        self._y = None
+        self._table = None
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.animate)
         self.timer.start(40)
@@ -20,49 +34,71 @@ class PulseWaveform(QWidget):
         self.phase = (self.phase + 0.15) % (2 * math.pi)
         self.update()
 
+    def _prepare(self, w, h):
+        self._size = (w, h)
+        self._pen = QPen(self.color, max(2, h // 10))
+        # x is fixed, only y is set each frame. Every inner point is the end of one
+        # segment and the start of the next, so both entries share the same QPoint
+        self._points = [QPoint(x, 0) for x in range(w)]
+        self._pairs = [point for i in range(1, w) for point in (self._points[i - 1], self._points[i])]
+        self._y = np.empty(w)
+        t = np.arange(w) / w * 2 * math.pi
+        # sin(t + phase) = sin t cos phase + cos t sin phase, so the table never changes with phase
+        self._table = (np.sin(t) * (h * 0.25), np.cos(t) * (h * 0.25), np.sin(t * 4) * (h * 0.08), np.cos(t * 4) * (h * 0.08))
+
     def paintEvent(self, event):
         w, h = self.width(), self.height()
+        if w < 2:
+            return
+        if self._size != (w, h):
+            self._prepare(w, h)
+        s1, c1, s4, c4 = self._table
+        p = self.phase
+        y = self._y
+        np.multiply(s1, math.cos(p), out=y)
+        y += c1 * math.sin(p)
+        y += s4 * math.cos(4 * p)
+        y += c4 * math.sin(4 * p)
+        y += h // 2
+        for point, value in zip(self._points, y.astype(int).tolist()):
+            point.setY(value)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
-        pen = QPen(self.color, max(2, h // 10))
-        painter.setPen(pen)
-        mid = h // 2
-        points = []
-        for x in range(w):
-            t = (x / w) * 2 * math.pi + self.phase
-            y = mid + math.sin(t) * (h * 0.25) + math.sin(t * 4) * (h * 0.08)
-            points.append((x, int(y)))
-        for i in range(1, len(points)):
-            painter.drawLine(points[i - 1][0], points[i - 1][1], points[i][0], points[i][1])
+        painter.setPen(self._pen)
+        # separate segments like the old per-pixel drawLine loop, so no line joins
+        painter.drawLines(self._pairs)
 
 
 class HistoryScreen(QDialog):
-    def __init__(self):
+    def __init__(self, store=None, title="Pulse Readings", unit="bpm"):
         super().__init__()
-        self.setWindowTitle("BP Readings")
+        self.setWindowTitle(title)
         self.setStyleSheet("background-color: #000; color: white;")
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(10, 10, 10, 10)
         main_layout.setSpacing(5)
 
-        title_label = QLabel("BP Readings")
+        title_label = QLabel(title)
         title_label.setFont(QFont("Arial", 16, QFont.Bold))
         title_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(title_label)
 
         self.readings_list = QListWidget()
-        readings = [
-            "120/80 mmHg",
-            "115/75 mmHg",
-            "130/85 mmHg",
-            "110/70 mmHg",
-            "125/78 mmHg"
-        ]
-        self.readings_list.addItems(readings)
+        self.readings_list.addItems(self.readings(store, unit) if store else ["No History Available"])
         main_layout.addWidget(self.readings_list)
 
         self.setLayout(main_layout)
 
+    @staticmethod
+    def readings(store, unit, latest=5, hours=24):
+        # newest readings, then one min-max/average line per hour; both are bounded reads
+        import datetime
+        rows = [f"{datetime.datetime.fromtimestamp(t):%H:%M:%S}  {v:.0f} {unit}" for t, v in store.tail(latest).tolist()[::-1]]
+        buckets = store.aggregate(datetime.datetime.now().timestamp() - hours * 3600, level="hour")
+        for t, low, high, total, count in buckets.tolist()[::-1]:
+            rows.append(f"{datetime.datetime.fromtimestamp(t):%a %H:00}  {low:.0f}-{high:.0f}, avg {total / count:.0f} {unit}")
+        return rows or ["No History Available"]
+
 
 class BPStatusBar(QWidget):
     def __init__(self, parent=None):
@@ -76,7 +112,7 @@ class BPStatusBar(QWidget):
         self.theme_toggle = QPushButton()
         self.theme_toggle.setFixedSize(24, 24)
         self.theme_toggle.setStyleSheet("background: transparent; border: none;")
-        self.theme_toggle.setIcon(QIcon(self.draw_theme_icon(24, 24, QColor("#1dcfe3"), QColor("#0c151c"))))
+        self.theme_toggle.setIcon(icons.icon("theme", 24, 24, "#1dcfe3", "#0c151c", "dark"))
         layout.addWidget(self.theme_toggle, alignment=Qt.AlignLeft)
 
         layout.addStretch()
@@ -84,7 +120,7 @@ class BPStatusBar(QWidget):
         # Battery icon (right)
         self.battery = QLabel()
         self.battery.setFixedSize(28, 18)
-        self.battery.setPixmap(self.draw_battery_icon(28, 18, QColor("#1dcfe3")))
+        self.battery.setPixmap(icons.pixmap("battery", 28, 18, "#1dcfe3", theme="dark"))
         layout.addWidget(self.battery, alignment=Qt.AlignRight)
 
         self.setLayout(layout)
@@ -93,34 +129,6 @@ class BPStatusBar(QWidget):
 
         self.theme_toggle.clicked.connect(self.toggle_theme)
 
-    def draw_battery_icon(self, width, height, color):
-        pix = QPixmap(width, height)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setPen(color)
-        body_w = int(width * 0.7)
-        body_h = int(height * 0.6)
-        p.drawRect(1, (height - body_h) // 2, body_w, body_h)
-        p.fillRect(2, (height - body_h) // 2 + 1, body_w - 3, body_h - 2, QColor("#2ECC40"))
-        tip_w = max(1, int(width * 0.15))
-        tip_h = max(1, int(height * 0.2))
-        p.drawRect(body_w + 1, (height - tip_h) // 2, tip_w, tip_h)
-        p.end()
-        return pix
-
-    def draw_theme_icon(self, width, height, color, fill):
-        pix = QPixmap(width, height)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setRenderHint(QPainter.Antialiasing)
-        p.setBrush(color)
-        p.setPen(Qt.NoPen)
-        p.drawEllipse(int(width * 0.15), int(height * 0.15), int(width * 0.7), int(height * 0.7))
-        p.setBrush(fill)
-        p.drawEllipse(int(width * 0.33), int(height * 0.15), int(width * 0.5), int(height * 0.7))
-        p.end()
-        return pix
-
     def toggle_theme(self):
         # Toggle between dark and light mode for the parent dialog
         if self.parent:
@@ -196,7 +204,7 @@ class PulseScreen(QDialog):
         self.timer.start(100)
 
         # History storage
-        self.history = []
+        self.store = VitalsStore(VITALS_PATH, "pulse")
         self.history_button.clicked.connect(self.show_history)
         self.back_button.clicked.connect(self.close)
 
@@ -226,18 +234,17 @@ class PulseScreen(QDialog):
         self.heart_widget.animate()
 
     def update_bpm(self):
-        import random, datetime
+        import random
         new_bpm = random.randint(60, 100)
         self.bpm_label.setText(f"{new_bpm} bpm")
         self.measuring_label.setText("Measuring...")
-        self.history.append((datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), new_bpm))
+        try:
+            self.store.append(new_bpm)
+        except OSError as e:
+            print(f"Pulse history error: {e}")
 
     def show_history(self):
-        if self.history:
-            history_text = "\n".join([f"{t}: {bpm} bpm" for t, bpm in self.history[-10:]])
-        else:
-            history_text = "No History Available"
-        QMessageBox.information(self, "Pulse History (last 10)", history_text)
+        HistoryScreen(self.store).exec_()
 
 
 class HeartWidget(QWidget):
@@ -363,6 +370,7 @@ class StatusBar(QWidget):
         self.icon_color = QColor("1dcfe3")
         self.icon_fill = QColor("#0c151c")
         self.parent = parent
+        self._icons_for = None
 
         self.resize_icons()
 
@@ -383,79 +391,13 @@ class StatusBar(QWidget):
         self.is_dark_mode = not self.is_dark_mode
         self.resize_icons()
 
-    def draw_battery_icon(self, width, height, color):
-        pix = QPixmap(width, height)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setPen(color)
-        body_w = int(width * 0.7)
-        body_h = int(height * 0.6)
-        p.drawRect(1, (height - body_h) // 2, body_w, body_h)
-        p.fillRect(2, (height - body_h) // 2 + 1, body_w - 3, body_h - 2, QColor("#2ECC40"))
-        tip_w = max(1, int(width * 0.15))
-        tip_h = max(1, int(height * 0.2))
-        p.drawRect(body_w + 1, (height - tip_h) // 2, tip_w, tip_h)
-        p.end()
-        return pix
-
-    def draw_wifi_icon(self, width, height, color):
-        pix = QPixmap(width, height)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        pen = p.pen()
-        pen.setColor(color)
-        pen.setWidth(max(1, width // 12))
-        p.setPen(pen)
-        p.drawArc(int(width * 0.1), int(height * 0.4), int(width * 0.8), int(height * 0.6), 0 * 16, 180 * 16)
-        p.drawArc(int(width * 0.25), int(height * 0.6), int(width * 0.5), int(height * 0.4), 0 * 16, 180 * 16)
-        p.drawArc(int(width * 0.45), int(height * 0.8), int(width * 0.1), int(height * 0.2), 0 * 16, 180 * 16)
-        p.setPen(Qt.NoPen)
-        p.setBrush(color)
-        dot_size = max(2, width // 8)
-        p.drawEllipse(int(width * 0.6), int(height * 0.9), dot_size, dot_size)
-        p.end()
-        return pix
-
-    def draw_settings_icon(self, width, height, color, fill):
-        pix = QPixmap(width, height)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setRenderHint(QPainter.Antialiasing)
-        p.setBrush(color)
-        p.setPen(Qt.NoPen)
-        center = pix.rect().center()
-        radius = min(width, height) * 0.3
-        teeth = 8
-        tooth_width = max(1, int(min(width, height) * 0.08))
-        tooth_height = max(2, int(min(width, height) * 0.15))
-        for i in range(teeth):
-            angle = (360 / teeth) * i
-            p.save()
-            p.translate(center)
-            p.rotate(angle)
-            p.drawRect(-tooth_width // 2, -int(radius) - tooth_height, tooth_width, tooth_height)
-            p.restore()
-        p.drawEllipse(center, int(radius), int(radius))
-        p.setBrush(fill)
-        p.drawEllipse(center, int(radius * 0.4), int(radius * 0.4))
-        p.end()
-        return pix
-
-    def draw_theme_icon(self, width, height, color, fill):
-        pix = QPixmap(width, height)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setRenderHint(QPainter.Antialiasing)
-        p.setBrush(color)
-        p.setPen(Qt.NoPen)
-        p.drawEllipse(int(width * 0.15), int(height * 0.15), int(width * 0.7), int(height * 0.7))
-        p.setBrush(fill)
-        p.drawEllipse(int(width * 0.33), int(height * 0.15), int(width * 0.5), int(height * 0.7))
-        p.end()
-        return pix
-
     def resize_icons(self):
         h = self.height()
+        theme = "dark" if self.is_dark_mode else "light"
+        # Dashboard calls this on every resize event; nothing to do unless the height or theme changed
+        if self._icons_for == (h, theme):
+            return
+        self._icons_for = (h, theme)
         battery_w = max(20, int(h * 20 / 24))
         battery_h = max(14, int(h * 14 / 24))
         wifi_w = max(24, int(h * 24 / 24))
@@ -463,17 +405,17 @@ class StatusBar(QWidget):
         icon_size = max(24, h)
 
         self.battery.setFixedSize(battery_w, battery_h)
-        self.battery.setPixmap(self.draw_battery_icon(battery_w, battery_h, self.icon_color))
+        self.battery.setPixmap(icons.pixmap("battery", battery_w, battery_h, self.icon_color, theme=theme))
 
         self.wifi.setFixedSize(wifi_w, wifi_h)
-        self.wifi.setPixmap(self.draw_wifi_icon(wifi_w, wifi_h, self.icon_color))
+        self.wifi.setPixmap(icons.pixmap("wifi", wifi_w, wifi_h, self.icon_color, theme=theme))
 
         self.settings.setFixedSize(icon_size, icon_size)
-        self.settings.setIcon(QIcon(self.draw_settings_icon(icon_size, icon_size, self.icon_color, self.icon_fill)))
+        self.settings.setIcon(icons.icon("settings", icon_size, icon_size, self.icon_color, self.icon_fill, theme))
         self.settings.setIconSize(QSize(icon_size, icon_size))
 
         self.theme_toggle.setFixedSize(icon_size, icon_size)
-        self.theme_toggle.setIcon(QIcon(self.draw_theme_icon(icon_size, icon_size, self.icon_color, self.icon_fill)))
+        self.theme_toggle.setIcon(icons.icon("theme", icon_size, icon_size, self.icon_color, self.icon_fill, theme))
         self.theme_toggle.setIconSize(QSize(icon_size, icon_size))
 
 
@@ -541,6 +483,7 @@ class Dashboard(QWidget):
         self._min_font_size_clock = 14
         self._min_font_size_date = 8
         self._min_btn_size = 48
+        self._sized_for = None
 
         self.resizeEvent(None)
 
@@ -556,54 +499,32 @@ class Dashboard(QWidget):
         self.date_label.setText(QDate.currentDate().toString("ddd, MMM d"))
 
     def resizeEvent(self, event):
-        w = max(self.width(), self._min_width)
         h = max(self.height(), self._min_height)
 
         clock_font_size = max(self._min_font_size_clock, int(h * 14 / self._min_height))
         date_font_size = max(self._min_font_size_date, int(h * 8 / self._min_height))
+        btn_size = max(self._min_btn_size, int(h * 48 / self._min_height))
 
-        self.clock_label.setFont(QFont("Roboto", clock_font_size, QFont.Bold))
-        self.date_label.setFont(QFont("Roboto", date_font_size))
+        # fonts and button icons only depend on these sizes, most resize events leave them alone
+        if self._sized_for != (clock_font_size, date_font_size, btn_size):
+            self._sized_for = (clock_font_size, date_font_size, btn_size)
+            self.clock_label.setFont(QFont("Roboto", clock_font_size, QFont.Bold))
+            self.date_label.setFont(QFont("Roboto", date_font_size))
 
-        btn_size = max(self._min_btn_size, int(h * 48 / self._min_height))
-        self.pulse_btn.setFixedSize(btn_size, btn_size)
-        self.ai_btn.setFixedSize(btn_size, btn_size)
+            self.pulse_btn.setFixedSize(btn_size, btn_size)
+            self.ai_btn.setFixedSize(btn_size, btn_size)
 
-        self.pulse_btn.setIcon(QIcon(self.draw_heart_icon(btn_size)))
-        self.pulse_btn.setIconSize(QSize(btn_size, btn_size))
+            self.pulse_btn.setIcon(icons.icon("heart", btn_size, btn_size, "white"))
+            self.pulse_btn.setIconSize(QSize(btn_size, btn_size))
 
-        self.ai_btn.setIcon(QIcon(self.draw_mic_icon(btn_size)))
-        self.ai_btn.setIconSize(QSize(btn_size, btn_size))
+            self.ai_btn.setIcon(icons.icon("mic", btn_size, btn_size, "white"))
+            self.ai_btn.setIconSize(QSize(btn_size, btn_size))
 
         self.status_bar.resize_icons()
         super().resizeEvent(event)
 
-    def draw_heart_icon(self, size):
-        pix = QPixmap(size, size)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setRenderHint(QPainter.Antialiasing)
-        p.setBrush(QColor("white"))
-        p.setPen(Qt.NoPen)
-        path = QPainterPath()
-        path.moveTo(size / 2, size * 0.79)
-        path.cubicTo(size * 0.125, size * 0.42, size * 0.29, size * 0.08, size / 2, size * 0.29)
-        path.cubicTo(size * 0.71, size * 0.08, size * 0.875, size * 0.42, size / 2, size * 0.79)
-        p.drawPath(path)
-        p.end()
-        return pix
-
-    def draw_mic_icon(self, size):
-        pix = QPixmap(size, size)
-        pix.fill(Qt.transparent)
-        p = QPainter(pix)
-        p.setBrush(QColor("white"))
-        p.setPen(Qt.NoPen)
-        p.drawRoundedRect(int(size * 0.375), int(size * 0.208), int(size * 0.25), int(size * 0.375), int(size * 0.125), int(size * 0.125))
-        p.drawRect(int(size * 0.458), int(size * 0.583), int(size * 0.083), int(size * 0.25))
-        p.drawEllipse(int(size * 0.375), int(size * 0.833), int(size * 0.25), int(size * 0.083))
-        p.end()
-        return pix
+    def icon_cache_stats(self):
+        return icons.PIXMAPS.stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+#ICONS
+#The status bar and dashboard icons, drawn with QPainter once per
+#(kind, size, color, fill, theme) and then served from a bounded LRU cache,
+#so resize storms and theme toggles are dictionary lookups instead of
+#repainting pixmaps. PIXMAPS.stats() reports hits and misses.
+
+from collections import OrderedDict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QIcon, QPainter, QPainterPath, QPixmap
+
+CACHE_SIZE = 64
+
+
+def draw_battery(width, height, color, fill):
+    pix = QPixmap(width, height)
+    pix.fill(Qt.transparent)
+    p = QPainter(pix)
+    p.setPen(color)
+    body_w = int(width * 0.7)
+    body_h = int(height * 0.6)
+    p.drawRect(1, (height - body_h) // 2, body_w, body_h)
+    p.fillRect(2, (height - body_h) // 2 + 1, body_w - 3, body_h - 2, QColor("#2ECC40"))
+    tip_w = max(1, int(width * 0.15))
+    tip_h = max(1, int(height * 0.2))
+    p.drawRect(body_w + 1, (height - tip_h) // 2, tip_w, tip_h)
+    p.end()
+    return pix
+
+
+def draw_wifi(width, height, color, fill):
+    pix = QPixmap(width, height)
+    pix.fill(Qt.transparent)
+    p = QPainter(pix)
+    pen = p.pen()
+    pen.setColor(color)
+    pen.setWidth(max(1, width // 12))
+    p.setPen(pen)
+    p.drawArc(int(width * 0.1), int(height * 0.4), int(width * 0.8), int(height * 0.6), 0 * 16, 180 * 16)
+    p.drawArc(int(width * 0.25), int(height * 0.6), int(width * 0.5), int(height * 0.4), 0 * 16, 180 * 16)
+    p.drawArc(int(width * 0.45), int(height * 0.8), int(width * 0.1), int(height * 0.2), 0 * 16, 180 * 16)
+    p.setPen(Qt.NoPen)
+    p.setBrush(color)
+    dot_size = max(2, width // 8)
+    p.drawEllipse(int(width * 0.6), int(height * 0.9), dot_size, dot_size)
+    p.end()
+    return pix
+
+
+def draw_settings(width, height, color, fill):
+    pix = QPixmap(width, height)
+    pix.fill(Qt.transparent)
+    p = QPainter(pix)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setBrush(color)
+    p.setPen(Qt.NoPen)
+    center = pix.rect().center()
+    radius = min(width, height) * 0.3
+    teeth = 8
+    tooth_width = max(1, int(min(width, height) * 0.08))
+    tooth_height = max(2, int(min(width, height) * 0.15))
+    for i in range(teeth):
+        angle = (360 / teeth) * i
+        p.save()
+        p.translate(center)
+        p.rotate(angle)
+        p.drawRect(-tooth_width // 2, -int(radius) - tooth_height, tooth_width, tooth_height)
+        p.restore()
+    p.drawEllipse(center, int(radius), int(radius))
+    p.setBrush(fill)
+    p.drawEllipse(center, int(radius * 0.4), int(radius * 0.4))
+    p.end()
+    return pix
+
+
+def draw_theme(width, height, color, fill):
+    pix = QPixmap(width, height)
+    pix.fill(Qt.transparent)
+    p = QPainter(pix)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setBrush(color)
+    p.setPen(Qt.NoPen)
+    p.drawEllipse(int(width * 0.15), int(height * 0.15), int(width * 0.7), int(height * 0.7))
+    p.setBrush(fill)
+    p.drawEllipse(int(width * 0.33), int(height * 0.15), int(width * 0.5), int(height * 0.7))
+    p.end()
+    return pix
+
+
+def draw_heart(width, height, color, fill):
+    size = min(width, height)
+    pix = QPixmap(size, size)
+    pix.fill(Qt.transparent)
+    p = QPainter(pix)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setBrush(color)
+    p.setPen(Qt.NoPen)
+    path = QPainterPath()
+    path.moveTo(size / 2, size * 0.79)
+    path.cubicTo(size * 0.125, size * 0.42, size * 0.29, size * 0.08, size / 2, size * 0.29)
+    path.cubicTo(size * 0.71, size * 0.08, size * 0.875, size * 0.42, size / 2, size * 0.79)
+    p.drawPath(path)
+    p.end()
+    return pix
+
+
+def draw_mic(width, height, color, fill):
+    size = min(width, height)
+    pix = QPixmap(size, size)
+    pix.fill(Qt.transparent)
+    p = QPainter(pix)
+    p.setBrush(color)
+    p.setPen(Qt.NoPen)
+    p.drawRoundedRect(int(size * 0.375), int(size * 0.208), int(size * 0.25), int(size * 0.375), int(size * 0.125), int(size * 0.125))
+    p.drawRect(int(size * 0.458), int(size * 0.583), int(size * 0.083), int(size * 0.25))
+    p.drawEllipse(int(size * 0.375), int(size * 0.833), int(size * 0.25), int(size * 0.083))
+    p.end()
+    return pix
+
+
+DRAW = {
+    "battery": draw_battery,
+    "wifi": draw_wifi,
+    "settings": draw_settings,
+    "theme": draw_theme,
+    "heart": draw_heart,
+    "mic": draw_mic,
+}
+
+
+class PixmapCache:
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, make):
+        item = self._items.get(key)
+        if item is not None:
+            self.hits += 1
+            self._items.move_to_end(key)
+            return item
+        self.misses += 1
+        item = self._items[key] = make()
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+        return item
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+PIXMAPS = PixmapCache()
+
+
+def pixmap(kind, width, height, color, fill=Qt.transparent, theme=None):
+    color, fill = QColor(color), QColor(fill)
+    key = ("pixmap", kind, width, height, color.rgba(), fill.rgba(), theme)
+    return PIXMAPS.get(key, lambda: DRAW[kind](width, height, color, fill))
+
+
+def icon(kind, width, height, color, fill=Qt.transparent, theme=None):
+    # QIcons are cached too so setIcon() gets the same object back
+    color, fill = QColor(color), QColor(fill)
+    key = ("icon", kind, width, height, color.rgba(), fill.rgba(), theme)
+    return PIXMAPS.get(key, lambda: QIcon(pixmap(kind, width, height, color, fill, theme)))
@@ -0,0 +1,91 @@
+#DISPLAY SCHEDULER
+#Decides when the panel gets a new frame. Instead of rendering on a fixed
+#timer it watches the window for Qt's own update requests (a label changed,
+#an animation called update()), so an idle screen costs nothing. The first
+#request arms a short single-shot timer and everything that arrives before
+#it fires lands in the same frame. Frames are spaced by the fps cap and by
+#how long the last frame's bytes took on the SPI bus; updates that come in
+#while waiting are folded into the next frame rather than queued behind it.
+
+import time
+from PyQt5.QtCore import QEvent, QObject, QTimer
+
+COALESCE_MS = 4
+
+
+class DisplayScheduler(QObject):
+    def __init__(self, renderer, max_fps=30, spi_hz=None, coalesce_ms=COALESCE_MS):
+        super().__init__()
+        self.renderer = renderer
+        self.window = renderer.window
+        self.min_interval = 1 / max_fps if max_fps else 0.0
+        self.spi_hz = spi_hz
+        self.coalesce_ms = coalesce_ms
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._render)
+        self._pending = False
+        self._waiting = False   # pending frame is held back by the rate cap
+        self._rendering = False
+        self._next = 0.0
+        self.requests = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.render_cpu = 0.0
+        self._started = time.perf_counter()
+
+    def start(self):
+        self.window.installEventFilter(self)
+        self.request()
+
+    def stop(self):
+        self.window.removeEventFilter(self)
+        self._timer.stop()
+
+    def eventFilter(self, obj, event):
+        # UpdateRequest reaches the top-level window once per batch of update() calls
+        if event.type() == QEvent.UpdateRequest and not self._rendering:
+            self.request()
+        return False
+
+    def request(self):
+        self.requests += 1
+        if self._pending:
+            if self._waiting:
+                self.dropped += 1
+            else:
+                self.coalesced += 1
+            return
+        self._pending = True
+        delay = max(self.coalesce_ms / 1000, self._next - time.perf_counter())
+        self._waiting = delay * 1000 > self.coalesce_ms
+        self._timer.start(int(delay * 1000))
+
+    def _render(self):
+        self._pending = self._waiting = False
+        start = time.perf_counter()
+        cpu = time.process_time()
+        self._rendering = True
+        try:
+            self.renderer.frame()
+        finally:
+            self._rendering = False
+        self.render_cpu += time.process_time() - cpu
+        self.frames += 1
+        # the bus needs this long for what was just sent, whether or not the driver waited for it
+        bus = self.renderer.pusher.last_bytes * 8 / self.spi_hz if self.spi_hz else 0.0
+        self._next = start + max(self.min_interval, bus)
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started
+        stats = {
+            "requests": self.requests,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "avg_fps": round(self.frames / elapsed, 2) if elapsed else 0.0,
+            "render_cpu_percent": round(self.render_cpu / elapsed * 100, 2) if elapsed else 0.0,
+        }
+        stats.update(self.renderer.stats())
+        return stats
@@ -0,0 +1,172 @@
+#ST7735 FRAME PUSH
+#Turns rendered RGB frames into what the panel wants and sends as little of
+#it as possible. Frames are converted to big-endian RGB565 in place with
+#numpy, compared with the previous frame, and only the rows/columns that
+#changed go over SPI, one address window per band of changed rows.
+#
+#FakePanel has the same set_window()/data() calls as the ST7735 driver but
+#keeps the pixels in memory, so the whole path runs without hardware.
+
+import sys
+import time
+from collections import deque
+import numpy as np
+
+WINDOW_BYTES = 11     # CASET + 4, RASET + 4, RAMWR: the cost of starting a rectangle
+ROW_GAP = 8           # changed rows closer than this share one rectangle
+MAX_RECTS = 8         # beyond this the bounding box of everything is sent instead
+
+
+def rgb565(rgb, out, scratch):
+    # (h, w, 3) uint8 -> out (h, w) uint16 holding the panel's big-endian RGB565
+    out[...] = rgb[..., 0]
+    out &= 0xF8
+    out <<= 8
+    scratch[...] = rgb[..., 1]
+    scratch &= 0xFC
+    scratch <<= 3
+    out |= scratch
+    scratch[...] = rgb[..., 2]
+    scratch >>= 3
+    out |= scratch
+    if sys.byteorder == "little":
+        out.byteswap(inplace=True)
+    return out
+
+
+def dirty_rects(changed, gap=ROW_GAP, limit=MAX_RECTS):
+    # changed is an (h, w) bool mask; returns inclusive (x0, y0, x1, y1) rectangles
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not rows.size:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) > gap)
+    bands = list(zip(np.r_[rows[0], rows[breaks + 1]], np.r_[rows[breaks], rows[-1]]))
+    if len(bands) > limit:
+        bands = [(rows[0], rows[-1])]
+    rects = []
+    for y0, y1 in bands:
+        cols = np.flatnonzero(changed[y0:y1 + 1].any(axis=0))
+        rects.append((int(cols[0]), int(y0), int(cols[-1]), int(y1)))
+    return rects
+
+
+class FramePusher:
+    def __init__(self, panel, width, height, gap=ROW_GAP, max_rects=MAX_RECTS):
+        self.panel = panel
+        self.width = width
+        self.height = height
+        self.gap = gap
+        self.max_rects = max_rects
+        # every buffer is allocated once; frame and previous swap roles each push
+        self.frame = np.zeros((height, width), dtype=np.uint16)
+        self.previous = np.zeros((height, width), dtype=np.uint16)
+        self._scratch = np.zeros((height, width), dtype=np.uint16)
+        self._changed = np.zeros((height, width), dtype=bool)
+        self._full = True
+        self.frames = 0
+        self.pushed = 0
+        self.rects = 0
+        self.bytes = 0
+        self.last_bytes = 0
+        self.convert_ms = 0.0
+        self.push_ms = 0.0
+        self._times = deque(maxlen=60)
+
+    def invalidate(self):
+        # next push sends the whole frame, e.g. after the panel was reset
+        self._full = True
+
+    def push(self, rgb):
+        start = time.perf_counter()
+        rgb565(rgb, self.frame, self._scratch)
+        if self._full:
+            rects = [(0, 0, self.width - 1, self.height - 1)]
+            self._full = False
+        else:
+            np.not_equal(self.frame, self.previous, out=self._changed)
+            rects = dirty_rects(self._changed, self.gap, self.max_rects)
+        converted = time.perf_counter()
+
+        sent = 0
+        for x0, y0, x1, y1 in rects:
+            data = self.frame[y0:y1 + 1, x0:x1 + 1].tobytes()
+            self.panel.set_window(x0, y0, x1, y1)
+            self.panel.data(data)
+            sent += WINDOW_BYTES + len(data)
+        done = time.perf_counter()
+        self.frame, self.previous = self.previous, self.frame
+
+        self.frames += 1
+        self.pushed += bool(rects)
+        self.rects += len(rects)
+        self.bytes += sent
+        self.last_bytes = sent
+        self.convert_ms = (converted - start) * 1000
+        self.push_ms = (done - converted) * 1000
+        self._times.append(done)
+        return rects
+
+    def fps(self):
+        if len(self._times) < 2:
+            return 0.0
+        return (len(self._times) - 1) / (self._times[-1] - self._times[0])
+
+    def stats(self):
+        full = self.width * self.height * 2 + WINDOW_BYTES
+        per_frame = self.bytes / self.frames if self.frames else 0.0
+        return {
+            "frames": self.frames,
+            "pushed": self.pushed,
+            "fps": round(self.fps(), 1),
+            "rects": self.rects,
+            "spi_bytes": self.bytes,
+            "bytes_per_frame": round(per_frame),
+            "last_bytes": self.last_bytes,
+            "saved": round(1 - per_frame / full, 3) if self.frames else 0.0,
+            "convert_ms": round(self.convert_ms, 2),
+            "push_ms": round(self.push_ms, 2),
+        }
+
+
+class FakePanel:
+    # the ST7735 driver's set_window()/data() into memory, optionally paced like a real bus
+    def __init__(self, width, height, spi_hz=None):
+        self.width = width
+        self.height = height
+        self.spi_hz = spi_hz
+        self.pixels = np.zeros((height, width), dtype=">u2")
+        self.window = (0, 0, width - 1, height - 1)
+        self.bytes = 0
+        self.windows = 0
+        self._cursor = 0
+
+    def set_window(self, x0=0, y0=0, x1=None, y1=None):
+        x1 = self.width - 1 if x1 is None else x1
+        y1 = self.height - 1 if y1 is None else y1
+        self.window = (x0, y0, x1, y1)
+        self.windows += 1
+        self._cursor = 0
+        self._wait(WINDOW_BYTES)
+
+    def data(self, data):
+        pixels = np.frombuffer(bytes(data), dtype=">u2")
+        x0, y0, x1, y1 = self.window
+        index = self._cursor + np.arange(pixels.size)
+        width = x1 - x0 + 1
+        self.pixels[y0 + index // width, x0 + index % width] = pixels
+        self._cursor += pixels.size
+        self._wait(len(data))
+
+    def _wait(self, count):
+        self.bytes += count
+        if self.spi_hz:
+            time.sleep(count * 8 / self.spi_hz)
+
+    def rgb(self):
+        # back to 8-bit RGB (low bits zero) to compare with what was rendered
+        value = self.pixels.astype(np.uint16)
+        out = np.empty(value.shape + (3,), dtype=np.uint8)
+        out[..., 0] = (value >> 8) & 0xF8
+        out[..., 1] = (value >> 3) & 0xFC
+        out[..., 2] = (value << 3) & 0xF8
+        return out
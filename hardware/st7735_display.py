@@ -1,52 +1,81 @@
-from PIL import Image
-from PIL import ImageDraw
-from PIL import ImageFont
+#ST7735 DISPLAY
+#Keeps the PyQt UI live on the 128x160 ST7735. One QApplication, one window
+#and one preallocated QImage for the life of the program. The window is
+#rendered into that image only when it asked to be repainted (see
+#display_scheduler.py) and panel.FramePusher sends whatever changed.
+#Without a desktop run it with QT_QPA_PLATFORM=offscreen.
+#
+#   python hardware/st7735_display.py --fps 20
+#   python hardware/st7735_display.py --fake --spi-hz 4000000   # no hardware, bus timing simulated
 
-import ST7735
-from gui import main
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QImage
+import argparse
 import numpy as np
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+from display_scheduler import DisplayScheduler
+from panel import FakePanel, FramePusher
+
+WIDTH = 128
+HEIGHT = 160
+SPI_HZ = 4000000
 
-disp = ST7735.ST7735(port=0, cs=0, dc=24, backlight=None, rst=25, width=128, height=160, rotation=0, invert=False)
 
-WIDTH = disp.width
-HEIGHT = disp.height
+def open_panel(fake=False, spi_hz=SPI_HZ):
+    if fake:
+        return FakePanel(WIDTH, HEIGHT, spi_hz)
+    import ST7735
+    return ST7735.ST7735(port=0, cs=0, dc=24, backlight=None, rst=25, width=WIDTH, height=HEIGHT,
+                         rotation=0, invert=False, spi_speed_hz=spi_hz or SPI_HZ)
 
-# img = Image.new('RGB', (WIDTH, HEIGHT))
-# draw = ImageDraw.Draw(img)
 
-# # Load default font.
-# font = ImageFont.load_default()
+class PanelRenderer:
+    def __init__(self, window, panel, width=WIDTH, height=HEIGHT):
+        self.window = window
+        self.window.resize(width, height)
+        self.image = QImage(width, height, QImage.Format_RGB888)
+        ptr = self.image.bits()
+        ptr.setsize(self.image.byteCount())
+        # numpy view of the QImage memory (rows may be padded), no copy per frame
+        rows = np.frombuffer(ptr, dtype=np.uint8).reshape(height, self.image.bytesPerLine())
+        self.pixels = rows[:, :width * 3].reshape(height, width, 3)
+        self.pusher = FramePusher(panel, width, height)
 
-# # Write some text
-# draw.text((5, 5), "Hello World!", font=font, fill=(255, 255, 255))
+    def frame(self):
+        self.window.render(self.image)
+        return self.pusher.push(self.pixels)
 
-# # Write buffer to display hardware, must be called to make things visible on the
-# # display!
-# disp.display(img)
+    def stats(self):
+        return self.pusher.stats()
 
-# Function to render the PyQt window to the ST7735 display
-def display_pyqt_on_st7735():
+
+# Mirror the PyQt window on the ST7735 display until the window is closed
+def display_pyqt_on_st7735(fps=20, fake=False, spi_hz=SPI_HZ, stats_every=5.0):
     app = QApplication([])
     from gui import MainWindow
     window = MainWindow()
-    window.resize(WIDTH, HEIGHT)
     window.show()
-    # Process events to ensure the window is rendered
-    app.processEvents()
-    # Render window to QImage
-    qimage = QImage(window.size(), QImage.Format_RGB888)
-    window.render(qimage)
-    # Convert QImage to numpy array
-    ptr = qimage.bits()
-    ptr.setsize(qimage.byteCount())
-    arr = np.array(ptr).reshape(qimage.height(), qimage.width(), 3)
-    # Convert numpy array to PIL Image
-    pil_img = Image.fromarray(arr, 'RGB')
-    disp.display(pil_img)
-    window.close()
-    app.quit()
+    renderer = PanelRenderer(window, open_panel(fake, spi_hz))
+    scheduler = DisplayScheduler(renderer, max_fps=fps, spi_hz=spi_hz)
+    scheduler.start()
+
+    if stats_every:
+        report = QTimer()
+        report.timeout.connect(lambda: print(scheduler.stats(), flush=True))
+        report.start(int(stats_every * 1000))
+    app.exec_()
+    print(scheduler.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror the PyQt UI onto the ST7735")
+    parser.add_argument("--fps", type=float, default=20, help="frame rate cap, frames are only rendered on change")
+    parser.add_argument("--fake", action="store_true", help="in-memory panel instead of SPI")
+    parser.add_argument("--spi-hz", type=int, default=SPI_HZ)
+    parser.add_argument("--stats", type=float, default=5.0, help="seconds between stats lines, 0 for none")
+    args = parser.parse_args()
+    display_pyqt_on_st7735(args.fps, args.fake, args.spi_hz, args.stats)
+
 
 if __name__ == "__main__":
-    display_pyqt_on_st7735()
\ No newline at end of file
+    main()
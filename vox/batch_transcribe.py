@@ -0,0 +1,126 @@
+#BATCH TRANSCRIPTION
+#Offline transcription of stored voice notes / audit logs across several cores.
+#The Vosk model is loaded once: with the fork start method the workers inherit
+#the parent's copy (pages are shared copy-on-write), elsewhere each worker loads
+#it once in its initializer. Results stream out as JSONL, one line per file,
+#with word timings.
+#
+#   python vox/batch_transcribe.py notes/ extra.flac --workers 4 > transcripts.jsonl
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import wave
+import numpy as np
+from vosk import Model, KaldiRecognizer, SetLogLevel
+
+MODEL_PATH = "models/vosk-model-small-en-us-0.15"
+AUDIO_EXTENSIONS = (".wav", ".flac")
+CHUNK_SECONDS = 0.5
+
+_model = None
+
+
+def find_audio(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(AUDIO_EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+
+def read_audio(path):
+    # returns (int16 mono samples, samplerate)
+    if path.lower().endswith(".flac"):
+        import soundfile  # only needed for FLAC
+        samples, rate = soundfile.read(path, dtype="int16", always_2d=True)
+    else:
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("expected 16-bit PCM")
+            rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            samples = samples.reshape(-1, wf.getnchannels())
+    if samples.shape[1] > 1:
+        samples = samples.mean(axis=1).astype(np.int16)
+    else:
+        samples = samples[:, 0]
+    return np.ascontiguousarray(samples), rate
+
+
+def _init_worker(model_path):
+    global _model
+    SetLogLevel(-1)
+    if _model is None:
+        _model = Model(model_path)
+
+
+def transcribe_file(path, model=None):
+    model = model or _model
+    start = time.perf_counter()
+    try:
+        samples, rate = read_audio(path)
+        recognizer = KaldiRecognizer(model, rate)
+        recognizer.SetWords(True)
+        pcm = samples.tobytes()
+        step = int(rate * CHUNK_SECONDS) * 2
+        segments = []
+        for offset in range(0, len(pcm), step):
+            if recognizer.AcceptWaveform(pcm[offset:offset + step]):
+                segments.append(json.loads(recognizer.Result()))
+        segments.append(json.loads(recognizer.FinalResult()))
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+    duration = len(samples) / rate
+    elapsed = time.perf_counter() - start
+    words = [w for seg in segments for w in seg.get("result", [])]
+    return {
+        "file": path,
+        "duration": round(duration, 3),
+        "text": " ".join(seg["text"] for seg in segments if seg.get("text")),
+        "words": words,
+        "elapsed": round(elapsed, 3),
+        "rtf": round(elapsed / duration, 4) if duration else None,
+    }
+
+
+def transcribe_many(paths, workers=None, model_path=MODEL_PATH):
+    # yields one result dict per file, in completion order
+    files = find_audio(paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files) or 1))
+    if "fork" in mp.get_all_start_methods():
+        ctx = mp.get_context("fork")
+        _init_worker(model_path)  # loaded here, inherited by the forked workers
+    else:
+        ctx = mp.get_context()
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+        yield from pool.imap_unordered(transcribe_file, files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe WAV/FLAC files to JSONL with word timings")
+    parser.add_argument("paths", nargs="+", help="audio files or directories")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--output", help="write JSONL here instead of stdout")
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in transcribe_many(args.paths, args.workers, args.model):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#BENCHMARK - batch transcription throughput
+#Transcribes the same set of files with 1, 2, 4, ... worker processes and
+#reports the aggregate real-time factor (wall time / audio time) and the speedup
+#over a single worker.
+#
+#   python vox/bench_batch.py notes/ --workers 1 2 4
+
+import argparse
+import os
+import time
+from batch_transcribe import MODEL_PATH, find_audio, transcribe_many
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor of batch transcription per worker count")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--workers", type=int, nargs="+")
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = args.workers or sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    print(f"{len(find_audio(args.paths))} file(s), {cores} core(s)")
+
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        audio, errors = 0.0, 0
+        for result in transcribe_many(args.paths, workers, args.model):
+            if "error" in result:
+                errors += 1
+            else:
+                audio += result["duration"]
+        wall = time.perf_counter() - start
+        baseline = baseline or wall
+        rtf = wall / audio if audio else float("nan")
+        print(f"{workers:>3} worker(s): {wall:7.2f} s wall for {audio:7.1f} s audio, "
+              f"RTF {rtf:.4f}, speedup {baseline / wall:.2f}x, {errors} error(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#BENCHMARK - wake latency vs CPU per decoder frame size
+#Replays WAV recordings that start with the wake word (any rate, mono 16-bit)
+#through the same path as recorder(): resample to 16 kHz, cut into FRAME_MS
+#frames, feed the wake word detector. For every frame size it reports how long
+#after the end of the spoken wake word the detector fired (audio delay plus the
+#time spent decoding that frame) and the decoder CPU per second of audio.
+#
+#   python vox/bench_block_size.py recordings/aria_*.wav --frames 20 50 100 250 500
+
+import argparse
+import statistics
+import time
+import wave
+import numpy as np
+from vosk import Model, SetLogLevel
+from resample import Resampler
+from wake_word import EnergyGate, WakeWordDetector
+
+MODEL_PATH = "models/vosk-model-small-en-us-0.15"
+SAMPLERATE = 16000
+
+
+def load(path):
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return wf.getframerate(), wf.readframes(wf.getnframes())
+
+
+def speech_end(pcm, threshold, gap_ms=250):
+    # end of the first voiced stretch, from 10 ms RMS frames
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    hop = SAMPLERATE // 100
+    frames = samples[:len(samples) // hop * hop].reshape(-1, hop)
+    voiced = np.sqrt(np.mean(frames * frames, axis=1)) >= threshold
+    idx = np.flatnonzero(voiced)
+    if idx.size == 0:
+        return None
+    end = idx[0]
+    for i in idx[1:]:
+        if (i - end) * 10 > gap_ms:
+            break
+        end = i
+    return (end + 1) / 100
+
+
+def run(model, rate, raw, frame_ms):
+    resampler = Resampler(rate, SAMPLERATE)
+    pcm = resampler.process(raw)
+    detector = WakeWordDetector(model, SAMPLERATE)
+    frame_bytes = SAMPLERATE * frame_ms // 1000 * 2
+    cpu = 0.0
+    fired_at = None
+    for offset in range(0, len(pcm), frame_bytes):
+        frame = pcm[offset:offset + frame_bytes]
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        fired = detector.accept(frame)
+        cpu += time.process_time() - cpu_start
+        if fired and fired_at is None:
+            heard_at = (offset + len(frame)) / 2 / SAMPLERATE
+            fired_at = heard_at + (time.perf_counter() - wall_start)
+    return pcm, fired_at, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wake latency and CPU per decoder frame size")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--frames", type=int, nargs="+", default=[20, 50, 100, 250, 500], help="frame sizes in ms")
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    SetLogLevel(-1)
+    model = Model(args.model)
+    clips = [load(path) for path in args.wavs]
+
+    print(f"{'frame':>6} {'detected':>9} {'latency p50':>12} {'latency max':>12} {'CPU %':>7}")
+    for frame_ms in args.frames:
+        latencies, cpu_total, audio_total = [], 0.0, 0.0
+        for rate, raw in clips:
+            pcm, fired_at, cpu = run(model, rate, raw, frame_ms)
+            cpu_total += cpu
+            audio_total += len(pcm) / 2 / SAMPLERATE
+            end = speech_end(pcm, EnergyGate().threshold)
+            if fired_at is not None and end is not None:
+                latencies.append((fired_at - end) * 1000)
+        cpu_pct = cpu_total / audio_total * 100 if audio_total else 0.0
+        if latencies:
+            print(f"{frame_ms:>4}ms {len(latencies):>4}/{len(clips):<4} {statistics.median(latencies):>9.0f} ms "
+                  f"{max(latencies):>9.0f} ms {cpu_pct:>6.1f}%")
+        else:
+            print(f"{frame_ms:>4}ms {0:>4}/{len(clips):<4} {'-':>12} {'-':>12} {cpu_pct:>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#BENCHMARK - time to first spoken sentence
+#Runs the blocking generateContent path and the streaming SSE path against the
+#local mock Gemini server and reports how long it takes until the speech worker
+#starts on the first sentence, and until the reply is fully spoken.
+#
+#   python vox/bench_first_sentence.py --chunk-delay 0.25 --runs 5
+
+import argparse
+import statistics
+import time
+from gemini_stream import StreamedReply
+from llm_client import LLMClient
+from mock_gemini import start_mock_server
+from speech import SpeechWorker
+
+DATA = {"contents": [{"parts": [{"text": "You are Aria."}, {"text": "what's the weather like"}]}]}
+
+
+class FakeSpeaker:
+    # stands in for pyttsx3: records when speaking starts and takes time per character
+    def __init__(self, seconds_per_char):
+        self.seconds_per_char = seconds_per_char
+        self.first_start = None
+
+    def __call__(self, text):
+        if self.first_start is None:
+            self.first_start = time.perf_counter()
+        time.sleep(len(text) * self.seconds_per_char)
+
+
+def run_blocking(client, speaker):
+    worker = SpeechWorker(speaker)
+    start = time.perf_counter()
+    worker.say(client.generate(DATA))
+    worker.wait()
+    return speaker.first_start - start, time.perf_counter() - start
+
+
+def run_streaming(client, speaker):
+    worker = SpeechWorker(speaker)
+    start = time.perf_counter()
+    reply = StreamedReply(client.stream(DATA))
+    for sentence in reply.sentences():
+        worker.say(sentence)
+    worker.wait()
+    return speaker.first_start - start, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first spoken sentence, blocking vs streaming")
+    parser.add_argument("--chunk-delay", type=float, default=0.2, help="seconds the mock server waits per chunk")
+    parser.add_argument("--char-time", type=float, default=0.01, help="fake TTS seconds per character")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(chunk_delay=args.chunk_delay)
+    client = LLMClient(base_url=base_url)
+    try:
+        for name, run in (("blocking", run_blocking), ("streaming", run_streaming)):
+            first, total = [], []
+            for _ in range(args.runs):
+                f, t = run(client, FakeSpeaker(args.char_time))
+                first.append(f)
+                total.append(t)
+            print(f"{name:>9}: first sentence {statistics.median(first) * 1000:7.1f} ms, "
+                  f"reply spoken {statistics.median(total) * 1000:7.1f} ms (median of {args.runs})")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#BENCHMARK - local intent fast-path
+#Times IntentMatcher.answer() on typical transcripts, both commands it should
+#answer and questions it must pass on to the LLM, and reports per phrase the
+#median and worst time. Everything should stay well under 10 ms.
+#
+#   python vox/bench_intents.py --repeat 1000
+
+import argparse
+import statistics
+import time
+from intents import VolumeControl, local_intents
+
+PHRASES = [
+    "what time is it",
+    "what's the date today",
+    "what day is it",
+    "what is my pulse",
+    "how is my heart rate",
+    "what was my pulse over the last hour",
+    "set volume to seventy five percent",
+    "volume up",
+    "turn it down",
+    "tell me a joke about computers",
+    # questions that only contain a command's words must reach the LLM
+    "what time does the super bowl start",
+    "what is the time difference between london and tokyo",
+    "what's today's weather",
+    "what is the date of easter next year",
+    "why are motorcycles louder than cars",
+    "which is softer gold or silver",
+    "what does mute mean",
+    "what is the capital of france",
+    "how far away is the moon from the earth in kilometers",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the local intent matcher")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    history = [("2025-01-01 12:00:00", 72)] * 10
+    matcher = local_intents(VolumeControl(), pulse_history=lambda: history,
+                            pulse_summary=lambda since: (61.0, 94.0, 74.2, 1200))
+    print(f"{'transcript':<56} {'intent':<12} {'p50 us':>8} {'max us':>8}")
+    worst = 0.0
+    for phrase in PHRASES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = matcher.answer(phrase)
+            timings.append((time.perf_counter() - start) * 1e6)
+        worst = max(worst, max(timings))
+        intent = result[0] if result else "-> LLM"
+        print(f"{phrase:<56} {intent:<12} {statistics.median(timings):>8.1f} {max(timings):>8.1f}")
+    print(f"\nworst case: {worst / 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
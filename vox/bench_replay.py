@@ -0,0 +1,300 @@
+#BENCHMARK - full pipeline replay
+#Runs the real AriaApp decoder and state machine on recorded audio instead of
+#a microphone: WAV files are fed through the audio callback in place of the
+#microphone stream, scripted key presses are posted as input events, and the
+#local mock Gemini server answers instead of the real API. Speech output
+#is simulated, so no audio device or PortAudio is needed and the whole thing
+#runs faster than real time while keeping the half-duplex and barge-in logic
+#intact.
+#
+#Ground truth: a file whose name contains the wake word ("aria_kitchen.wav")
+#is expected to trigger it once, any other file never. A --manifest JSON file
+#can say otherwise and script key presses, times in seconds from clip start:
+#
+#   {"notes_1.wav": {"wakes": 0, "keys": [[0.2, "s"], [4.0, "q"]]}}
+#
+#Reports wake detection rate, false accepts per hour, per-stage latency from
+#the turn traces, CPU and peak memory, and saves them as JSON so a later run
+#can be compared against it:
+#
+#   python vox/bench_replay.py recordings/*.wav --out results/replay_base.json
+#   python vox/bench_replay.py recordings/*.wav --compare results/replay_base.json
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import threading
+import time
+import wave
+from vox_ai_assistant import AriaApp, IDLE, QUIT, WAKE_SOURCE, make_llm
+from inputs import DEFAULT_KEYS
+from mock_gemini import start_mock_server
+from resample import Resampler
+from response_cache import ResponseCache
+from trace_summary import percentile
+from tracing import SPANS, Tracer
+from wake_word import WAKE_WORD
+
+BLOCK_MS = 20            # what a typical host API hands the callback
+GAP_SECONDS = 2.0        # silence after every clip so the endpoint can fire
+WAKE_GRACE = 1.5         # a wake this long after a clip ended still counts for it
+WORDS_PER_SECOND = 2.5   # simulated speaking rate
+
+
+def load(path, rate):
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return Resampler(wf.getframerate(), rate).process(wf.readframes(wf.getnframes()))
+
+
+class Clip:
+    __slots__ = ("path", "pcm", "wakes", "keys", "start", "end")
+
+    def __init__(self, path, pcm, wakes, keys):
+        self.path = path
+        self.pcm = pcm
+        self.wakes = wakes
+        self.keys = keys
+        self.start = self.end = 0.0
+
+
+class ScriptedKeys:
+    # an input source whose keys are pressed by the replay script
+    def __init__(self, post, keys=DEFAULT_KEYS):
+        self.post = post
+        self.keys = keys
+
+    def start(self):
+        pass
+
+    def press(self, key):
+        self.post(self.keys[key], f"key {key}")
+
+    def close(self):
+        pass
+
+
+class ReplayStream:
+    # stands in for the microphone stream: pushes the clips through the callback
+    def __init__(self, app, clips, speed):
+        self.app = app
+        self.clips = clips
+        self.keys = app.keys
+        self.speed = speed
+        self.byte_rate = app.capture_rate * 2
+        self.fed = 0
+        self.finished = threading.Event()
+        self.callback = None
+
+    def __enter__(self):
+        threading.Thread(target=self._feed, name="replay", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def decoded_seconds(self):
+        return (self.fed - self.app.audio.fill()) / self.byte_rate
+
+    def _feed(self):
+        block = self.app.capture_rate * BLOCK_MS // 1000 * 2
+        # unthrottled replay goes as fast as the decoder keeps up, never overrunning the ring
+        backlog = self.app.frame_bytes * 2
+        start = time.perf_counter()
+        gap = bytes(int(GAP_SECONDS * self.byte_rate) // 2 * 2)
+        for clip in self.clips:
+            clip.start = self.fed / self.byte_rate
+            keys = sorted(clip.keys)
+            pcm = clip.pcm + gap
+            clip.end = clip.start + len(clip.pcm) / self.byte_rate
+            for offset in range(0, len(pcm), block):
+                while keys and self.decoded_seconds() >= clip.start + keys[0][0]:
+                    self.keys.press(keys.pop(0)[1])
+                if self.speed:
+                    delay = start + self.fed / self.byte_rate / self.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    while self.app.audio.fill() > backlog:
+                        time.sleep(0.0005)
+                chunk = pcm[offset:offset + block]
+                self.callback(chunk, len(chunk) // 2, None, None)
+                self.fed += len(chunk)
+            for _, key in keys:
+                self.keys.press(key)
+        self.finished.set()
+
+
+class ReplayApp(AriaApp):
+    # the real assistant with simulated speech and in-memory caches
+    def __init__(self, base_url, speed, capture_rate):
+        super().__init__(capture_rate=capture_rate)
+        self.keys = ScriptedKeys(self.post)
+        self.inputs = [self.keys]
+        self.speed = speed
+        self.stream = None
+        self.wakes = []
+        self.spoken = []
+        self._interrupt = threading.Event()
+        self.engine.factory = lambda: None
+        self.tts_cache.factory = lambda: None
+        self.llm.factory = lambda: make_llm(gemini_url=base_url, api_key="mock")
+        self.response_cache.factory = lambda: ResponseCache(":memory:")
+        self.tracer = Tracer()
+
+    def open_input_stream(self):
+        self.stream.callback = self.audio_callback
+        return self.stream
+
+    def speak(self, text):
+        self.spoken.append(text)
+        if self.speed:
+            self._interrupt.clear()
+            self._interrupt.wait(len(text.split()) / WORDS_PER_SECOND / self.speed)
+
+    def stop_speaking(self):
+        self._interrupt.set()
+
+    def start_listening(self, source, block=None):
+        if source == WAKE_SOURCE:
+            self.wakes.append(self.stream.decoded_seconds())
+        super().start_listening(source, block)
+
+    def idle(self):
+        # every turn that was started has been traced to the end, nothing left to decode
+        return (self.state == IDLE and self.events.empty() and self.tracer.turns == self.tracer.started
+                and self.audio.fill() < self.frame_bytes)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def score_wakes(clips, wakes):
+    expected = detected = false_accepts = 0
+    for clip in clips:
+        hits = sum(1 for t in wakes if clip.start <= t <= clip.end + WAKE_GRACE)
+        expected += clip.wakes
+        detected += min(hits, clip.wakes)
+        false_accepts += max(0, hits - clip.wakes)
+    return expected, detected, false_accepts
+
+
+def run(clips, speed, chunk_delay, capture_rate):
+    server, base_url = start_mock_server(chunk_delay=chunk_delay)
+    app = ReplayApp(base_url, speed, capture_rate)
+    app.stream = stream = ReplayStream(app, clips, speed)
+    for component in app.components:
+        component.start()
+    app.model.get()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    runner = threading.Thread(target=app.run, daemon=True)
+    runner.start()
+    stream.finished.wait()
+    while not app.idle():
+        time.sleep(0.01)
+    app.post(QUIT)
+    runner.join()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    server.shutdown()
+
+    audio_seconds = stream.fed / stream.byte_rate
+    expected, detected, false_accepts = score_wakes(clips, app.wakes)
+    records = [r for r in app.tracer.recent if not r["cancelled"]]
+    spans = {}
+    for name, _, _ in SPANS:
+        values = sorted(r["spans_ms"][name] for r in records if name in r["spans_ms"])
+        if values:
+            spans[name] = {"p50": percentile(values, 0.5), "p95": percentile(values, 0.95),
+                           "p99": percentile(values, 0.99), "count": len(values)}
+    return {
+        "revision": git_revision(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "clips": len(clips),
+        "audio_seconds": round(audio_seconds, 2),
+        "wall_seconds": round(wall, 2),
+        "speedup": round(audio_seconds / wall, 2) if wall else None,
+        "cpu_seconds": round(cpu, 2),
+        "cpu_percent_of_audio": round(cpu / audio_seconds * 100, 2) if audio_seconds else None,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "wake": {
+            "expected": expected,
+            "detected": detected,
+            "detection_rate": round(detected / expected, 3) if expected else None,
+            "false_accepts": false_accepts,
+            "false_accepts_per_hour": round(false_accepts / (audio_seconds / 3600), 2) if audio_seconds else None,
+        },
+        "turns": len(records),
+        "cancelled_turns": app.tracer.cancelled,
+        "overruns": app.audio.overruns,
+        "spans_ms": spans,
+    }
+
+
+def flatten(result, prefix=""):
+    for key, value in result.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", value
+
+
+def report(result, baseline=None):
+    old = dict(flatten(baseline)) if baseline else {}
+    if baseline:
+        print(f"{'metric':<40} {'base ' + baseline['revision']:>14} {'now ' + result['revision']:>14} {'change':>9}")
+    for key, value in flatten(result):
+        if key not in old:
+            print(f"{key:<40} {'':>14} {value:>14}" if baseline else f"{key:<40} {value:>14}")
+            continue
+        change = f"{(value - old[key]) / old[key] * 100:+.1f}%" if old[key] else ""
+        print(f"{key:<40} {old[key]:>14} {value:>14} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recordings through the full assistant pipeline")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--manifest", help="JSON with expected wakes and key presses per file")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="replay speed, 1.0 is real time, 0 runs as fast as the decoder keeps up")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="mock Gemini delay per chunk")
+    parser.add_argument("--capture-rate", type=int, default=16000, help="mic rate the recordings are fed at")
+    parser.add_argument("--out", help="save the results as JSON")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    manifest = {}
+    if args.manifest:
+        with open(args.manifest) as f:
+            manifest = json.load(f)
+    clips = []
+    for path in args.wavs:
+        entry = manifest.get(os.path.basename(path), {})
+        wakes = entry.get("wakes", 1 if WAKE_WORD in os.path.basename(path).lower() else 0)
+        clips.append(Clip(path, load(path, args.capture_rate), wakes, [tuple(k) for k in entry.get("keys", [])]))
+
+    result = run(clips, args.speed, args.chunk_delay, args.capture_rate)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(result, baseline)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nsaved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
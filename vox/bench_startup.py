@@ -0,0 +1,42 @@
+#BENCHMARK - startup time
+#Measures how long importing the assistant takes and when each background
+#component (Vosk model, wake word recognizer, TTS engine, caches, LLM client)
+#becomes ready after AriaApp.start(). Run from the repository root.
+#
+#   python vox/bench_startup.py
+
+import argparse
+import time
+
+import_start = time.perf_counter()
+import vox_ai_assistant
+import_seconds = time.perf_counter() - import_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to ready per assistant component")
+    parser.add_argument("--capture-rate", type=int, default=16000,
+                        help="skip querying the audio device by giving the mic rate")
+    args = parser.parse_args()
+
+    print(f"import vox_ai_assistant: {import_seconds * 1000:8.1f} ms")
+    start = time.perf_counter()
+    app = vox_ai_assistant.AriaApp(capture_rate=args.capture_rate)
+    print(f"AriaApp():               {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    app.start()
+    for component in app.components:
+        try:
+            component.get()
+        except Exception:
+            pass
+    print(f"all components settled:  {(time.perf_counter() - start) * 1000:8.1f} ms\n")
+
+    for component in sorted(app.components, key=lambda c: c.ready_at):
+        ready = (component.ready_at - start) * 1000
+        print(f"{component.name:<16} {component.status():<7} ready at {ready:8.1f} ms "
+              f"(loaded in {component.load_seconds * 1000:8.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
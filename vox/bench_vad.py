@@ -0,0 +1,136 @@
+#BENCHMARK - voice activity detection
+#Transcribes each recording twice, once decoding every block and once only
+#what the VAD lets through, and reports decoder CPU, how much audio was
+#skipped, and word error rate for both. The reference transcript is
+#<name>.txt next to the WAV when it exists, otherwise the full decode.
+#With <name>.segments.json ([[start, end], ...] seconds of speech) it also
+#reports block-level precision and recall of the speech/silence decision.
+#
+#   python vox/bench_vad.py testset/*.wav --frame-ms 100
+
+import argparse
+import json
+import os
+import time
+import wave
+from vosk import Model, KaldiRecognizer, SetLogLevel
+from resample import Resampler
+from vad import VoiceActivityDetector
+
+MODEL_PATH = "models/vosk-model-small-en-us-0.15"
+SAMPLERATE = 16000
+
+
+def load(path):
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return Resampler(wf.getframerate(), SAMPLERATE).process(wf.readframes(wf.getnframes()))
+
+
+def word_errors(reference, hypothesis):
+    # word-level Levenshtein distance
+    ref, hyp = reference.split(), hypothesis.split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1], len(ref)
+
+
+def transcribe(model, blocks):
+    recognizer = KaldiRecognizer(model, SAMPLERATE)
+    words = []
+    for block in blocks:
+        if recognizer.AcceptWaveform(block):
+            words.append(json.loads(recognizer.Result()).get("text", ""))
+    words.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    return " ".join(w for w in words if w)
+
+
+def gated(vad, blocks):
+    for block in blocks:
+        yield from vad.process(block)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decoder CPU and accuracy with and without VAD")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--frame-ms", type=int, default=100)
+    parser.add_argument("--no-webrtc", action="store_true", help="use the numpy classifier even if webrtcvad is installed")
+    args = parser.parse_args()
+
+    SetLogLevel(-1)
+    model = Model(args.model)
+    step = SAMPLERATE * args.frame_ms // 1000 * 2
+    totals = {"audio": 0.0, "cpu_full": 0.0, "cpu_vad": 0.0, "errors_full": 0, "errors_vad": 0, "words": 0,
+              "blocks": 0, "skipped": 0, "tp": 0, "fp": 0, "fn": 0}
+    webrtc = False
+    print(f"{'file':<28} {'skipped':>8} {'cpu full':>9} {'cpu vad':>9} {'WER full':>9} {'WER vad':>8}")
+    for path in args.wavs:
+        pcm = load(path)
+        blocks = [pcm[i:i + step] for i in range(0, len(pcm), step)]
+        audio = len(pcm) / 2 / SAMPLERATE
+
+        start = time.process_time()
+        full = transcribe(model, blocks)
+        cpu_full = time.process_time() - start
+
+        vad = VoiceActivityDetector(SAMPLERATE, use_webrtc=False if args.no_webrtc else None)
+        webrtc = vad.webrtc is not None
+        start = time.process_time()
+        text = transcribe(model, gated(vad, blocks))
+        cpu_vad = time.process_time() - start
+        skipped = vad.stats()["skipped"]
+
+        stem = os.path.splitext(path)[0]
+        reference = full
+        if os.path.exists(stem + ".txt"):
+            with open(stem + ".txt") as f:
+                reference = f.read().lower().strip()
+        errors_full, words = word_errors(reference, full)
+        errors_vad, _ = word_errors(reference, text)
+
+        if os.path.exists(stem + ".segments.json"):
+            with open(stem + ".segments.json") as f:
+                segments = json.load(f)
+            labeler = VoiceActivityDetector(SAMPLERATE, use_webrtc=False if args.no_webrtc else None)
+            for i, block in enumerate(blocks):
+                t0, t1 = i * args.frame_ms / 1000, (i + 1) * args.frame_ms / 1000
+                truth = any(a < t1 and b > t0 for a, b in segments)
+                said = labeler.is_voiced(block)
+                totals["tp"] += truth and said
+                totals["fp"] += said and not truth
+                totals["fn"] += truth and not said
+
+        totals["audio"] += audio
+        totals["cpu_full"] += cpu_full
+        totals["cpu_vad"] += cpu_vad
+        totals["errors_full"] += errors_full
+        totals["errors_vad"] += errors_vad
+        totals["words"] += words
+        totals["blocks"] += len(blocks)
+        totals["skipped"] += round(skipped * len(blocks))
+        wer_full = errors_full / words if words else 0.0
+        wer_vad = errors_vad / words if words else 0.0
+        print(f"{os.path.basename(path)[:28]:<28} {skipped:>7.0%} {cpu_full:>8.2f}s {cpu_vad:>8.2f}s "
+              f"{wer_full:>8.1%} {wer_vad:>7.1%}")
+
+    t = totals
+    print(f"\n{len(args.wavs)} file(s), {t['audio']:.1f} s of audio, classifier: {'webrtcvad' if webrtc else 'energy+zcr'}")
+    print(f"skipped blocks: {t['skipped'] / t['blocks']:.0%}" if t["blocks"] else "skipped blocks: -")
+    if t["cpu_full"]:
+        print(f"decoder CPU: {t['cpu_full']:.2f} s -> {t['cpu_vad']:.2f} s "
+              f"({(1 - t['cpu_vad'] / t['cpu_full']) * 100:.0f}% less)")
+    if t["words"]:
+        print(f"WER: full {t['errors_full'] / t['words']:.1%}, with VAD {t['errors_vad'] / t['words']:.1%}")
+    if t["tp"] + t["fp"] + t["fn"]:
+        precision = t["tp"] / (t["tp"] + t["fp"]) if t["tp"] + t["fp"] else 0.0
+        recall = t["tp"] / (t["tp"] + t["fn"]) if t["tp"] + t["fn"] else 0.0
+        print(f"speech blocks: precision {precision:.1%}, recall {recall:.1%}")
+
+
+if __name__ == "__main__":
+    main()
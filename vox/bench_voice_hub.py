@@ -0,0 +1,105 @@
+#BENCHMARK - voice hub load generator
+#Replays WAV files into a running voice_hub.py as N simultaneous clients, paced
+#at real time like a live mic, and reports for every N how long after the end
+#of the audio the final transcript arrived and how many clients were turned
+#away. The largest N whose p95 stays under --max-latency is what one box can
+#sustain.
+#
+#   python vox/voice_hub.py --no-llm --max-sessions 32 &
+#   python vox/bench_voice_hub.py recordings/*.wav --sessions 1 2 4 8 16 32
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+import wave
+from resample import Resampler
+
+RATE = 16000
+CHUNK_MS = 100
+
+
+def load(path):
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return Resampler(wf.getframerate(), RATE).process(wf.readframes(wf.getnframes()))
+
+
+async def client(host, port, name, pcm, speed):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((json.dumps({"session": name, "rate": RATE}) + "\n").encode())
+    first = json.loads(await reader.readline())
+    if first["type"] == "busy":
+        writer.close()
+        return None
+
+    finals = []
+
+    async def receive():
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            event = json.loads(line)
+            if event["type"] == "final":
+                finals.append(time.perf_counter())
+            elif event["type"] == "bye":
+                return
+
+    receiver = asyncio.create_task(receive())
+    step = RATE * CHUNK_MS // 1000 * 2
+    start = time.perf_counter()
+    for i, offset in enumerate(range(0, len(pcm), step)):
+        writer.write(pcm[offset:offset + step])
+        await writer.drain()
+        # pace like a real microphone
+        delay = start + (i + 1) * CHUNK_MS / 1000 / speed - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    audio_end = time.perf_counter()
+    writer.write_eof()
+    await receiver
+    writer.close()
+    return (finals[-1] - audio_end) * 1000 if finals else None
+
+
+async def run_level(host, port, clips, sessions, speed):
+    names = (f"load-{i}" for i in itertools.count())
+    jobs = [client(host, port, next(names), pcm, speed) for pcm, _ in zip(itertools.cycle(clips), range(sessions))]
+    return await asyncio.gather(*jobs, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent session load test for voice_hub.py")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 1.0 is real time")
+    parser.add_argument("--max-latency", type=float, default=1500, help="p95 ms still counted as keeping up")
+    args = parser.parse_args()
+
+    clips = [load(path) for path in args.wavs]
+    sustained = 0
+    print(f"{'sessions':>8} {'served':>7} {'busy':>5} {'errors':>6} {'final p50':>10} {'final p95':>10}")
+    for sessions in args.sessions:
+        results = asyncio.run(run_level(args.host, args.port, clips, sessions, args.speed))
+        errors = [r for r in results if isinstance(r, Exception)]
+        latencies = sorted(r for r in results if isinstance(r, float))
+        busy = sum(1 for r in results if r is None)
+        if latencies:
+            p50 = statistics.median(latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            if p95 <= args.max_latency and not busy and not errors:
+                sustained = sessions
+            print(f"{sessions:>8} {len(latencies):>7} {busy:>5} {len(errors):>6} {p50:>7.0f} ms {p95:>7.0f} ms")
+        else:
+            print(f"{sessions:>8} {0:>7} {busy:>5} {len(errors):>6} {'-':>10} {'-':>10}")
+    print(f"\nsustained: {sustained} concurrent session(s) with p95 <= {args.max_latency:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
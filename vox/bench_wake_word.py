@@ -0,0 +1,86 @@
+#BENCHMARK - idle CPU cost of the wake word stage
+#Replays recorded WAV files (16 kHz, mono, 16-bit) through the old passive loop
+#(full KaldiRecognizer on every block) and through the gated wake word detector,
+#then reports decoder CPU seconds per hour of audio.
+#
+#   python vox/bench_wake_word.py recordings/*.wav
+
+import argparse
+import json
+import time
+import wave
+from vosk import Model, KaldiRecognizer, SetLogLevel
+from wake_word import WakeWordDetector, WAKE_WORD
+
+MODEL_PATH = "models/vosk-model-small-en-us-0.15"
+BLOCKSIZE = 8000
+
+
+def read_blocks(path, blocksize):
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        rate = wf.getframerate()
+        blocks = []
+        while True:
+            data = wf.readframes(blocksize)
+            if not data:
+                break
+            blocks.append(data)
+    return rate, blocks
+
+
+def run_full(model, rate, blocks):
+    # what recorder() did before: full decode of every block, compare final text
+    recognizer = KaldiRecognizer(model, rate)
+    hits = 0
+    for data in blocks:
+        if recognizer.AcceptWaveform(data):
+            spoken = json.loads(recognizer.Result()).get("text", "").lower().strip()
+            if spoken == WAKE_WORD:
+                hits += 1
+    return hits
+
+
+def run_wake(model, rate, blocks):
+    detector = WakeWordDetector(model, rate)
+    hits = 0
+    for data in blocks:
+        if detector.accept(data):
+            hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare idle CPU of the full decoder vs the wake word stage")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--blocksize", type=int, default=BLOCKSIZE)
+    args = parser.parse_args()
+
+    SetLogLevel(-1)
+    model = Model(args.model)
+
+    clips = []
+    audio_seconds = 0.0
+    for path in args.wavs:
+        rate, blocks = read_blocks(path, args.blocksize)
+        clips.append((rate, blocks))
+        audio_seconds += sum(len(b) for b in blocks) / 2 / rate
+
+    print(f"{len(clips)} file(s), {audio_seconds:.1f} s of audio")
+    for name, run in (("full", run_full), ("wake", run_wake)):
+        hits = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for rate, blocks in clips:
+            hits += run(model, rate, blocks)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        per_hour = cpu / audio_seconds * 3600 if audio_seconds else 0.0
+        print(f"{name:>5}: {per_hour:8.1f} CPU-s per audio hour  "
+              f"({cpu:.2f} s CPU, {wall:.2f} s wall, {hits} wake hit(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#BACKGROUND COMPONENTS
+#Wraps a slow-to-build object (Vosk model, TTS engine, ...) so it is built on
+#its own thread, either eagerly with start() or lazily on first get(), and
+#reports its own readiness and load time.
+
+import threading
+import time
+
+
+class Component:
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.value = None
+        self.error = None
+        self.started_at = None
+        self.ready_at = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.started_at is not None:
+                return
+            self.started_at = time.perf_counter()
+        threading.Thread(target=self._load, name=f"load {self.name}", daemon=True).start()
+
+    def _load(self):
+        try:
+            self.value = self.factory()
+        except Exception as e:
+            self.error = e
+            print(f"Failed to load {self.name}: {e}")
+        finally:
+            self.ready_at = time.perf_counter()
+            self._ready.set()
+
+    def get(self, timeout=None):
+        self.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"{self.name} is still loading")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    @property
+    def ready(self):
+        return self._ready.is_set() and self.error is None
+
+    @property
+    def load_seconds(self):
+        if self.ready_at is None:
+            return None
+        return self.ready_at - self.started_at
+
+    def status(self):
+        if self.started_at is None:
+            return "idle"
+        if not self._ready.is_set():
+            return "loading"
+        return "failed" if self.error is not None else "ready"
@@ -0,0 +1,58 @@
+#CONFIGURATION
+#Settings shared by the local assistant and the voice hub: recognizer models,
+#the LLM request and backends, conversation history. No audio imports here,
+#so the hub can run headless without PortAudio or a TTS engine.
+
+from llm_client import GEMINI_BASE_URL
+from llm_backends import GeminiBackend, OpenAICompatibleBackend, RuleBackend, LLMRouter
+from request_builder import RequestBuilder, load_api_key, API_KEY_ENV, API_KEY_FILE
+
+LANGUAGE = "english"
+MODEL_PATHS = {
+    "english": "models/vosk-model-small-en-us-0.15",
+}
+
+GEMINI_MODEL = "gemini-2.0-flash"
+MAX_OUTPUT_TOKENS = 150  # replies are spoken, a few sentences at most
+TEMPERATURE = 0.7
+SAFETY_THRESHOLD = "BLOCK_ONLY_HIGH"
+LOCAL_LLM_URL = None     # OpenAI-compatible server used when Gemini is slow or down, e.g. "http://localhost:8080/v1"
+LOCAL_LLM_MODEL = "local"
+LLM_LATENCY_BUDGET = 2.5 # seconds to first text before a backend counts as too slow
+
+HISTORY_CHARS = 3000     # budget for earlier turns sent with each request
+HISTORY_IDLE = 300       # seconds of silence before a conversation starts over
+
+#GEMINI
+SYSTEM_MESSAGE = (
+    "You are Aria, a smart, witty, and polite personal assistant AI. "
+    "You are helpful, concise, and always respond as if you're speaking to your user personally."
+    "You only answer briefly to all inquiries."
+    # "You speak in bantoanon, a dialect in the romblon, phippines."
+)
+
+# system prompt, limits and safety settings are encoded once, turns are spliced in
+REQUESTS = RequestBuilder(SYSTEM_MESSAGE, max_output_tokens=MAX_OUTPUT_TOKENS, temperature=TEMPERATURE,
+                          safety_threshold=SAFETY_THRESHOLD)
+
+def gemini_request(user_input, history=(), summary=""):
+    return REQUESTS.build(user_input, history, summary)
+
+def make_llm(gemini_url=GEMINI_BASE_URL, pool_size=4, api_key=None):
+    # Gemini first, then the local server if there is one, canned offline answers last
+    # the key is read here rather than at import: $GEMINI_API_KEY or ~/.config/vox/gemini_api_key, never in source
+    api_key = api_key or load_api_key()
+    backends = []
+    # only Google's endpoint needs a key; a local Gemini-compatible server (mock_gemini, a proxy) doesn't
+    if api_key or gemini_url != GEMINI_BASE_URL:
+        backends.append(GeminiBackend(api_key=api_key, base_url=gemini_url, model=GEMINI_MODEL, pool_size=pool_size))
+    else:
+        print(f"No Gemini API key, set ${API_KEY_ENV} or put it in {API_KEY_FILE}.")
+    if LOCAL_LLM_URL:
+        backends.append(OpenAICompatibleBackend(LOCAL_LLM_URL, LOCAL_LLM_MODEL, pool_size=pool_size))
+    backends.append(RuleBackend())
+    return LLMRouter(backends, latency_budget=LLM_LATENCY_BUDGET)
+
+def prompt_chars(data):
+    return REQUESTS.prompt_chars(data)
+
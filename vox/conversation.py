@@ -0,0 +1,122 @@
+#CONVERSATION MEMORY
+#Keeps the previous turns of each session so follow-up questions work, while
+#holding every request to a fixed character budget: once a history grows past
+#it the oldest turns are dropped (or folded into a running summary when a
+#summarize function is given). Sessions idle for too long are forgotten.
+
+import threading
+import time
+from collections import deque
+
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for budgeting
+
+
+def brief_summary(previous, dropped, limit=60):
+    # cheap local "summary": keeps what the user asked about in dropped turns
+    asked = [text[:limit] for role, text in dropped if role == "user"]
+    return "; ".join(filter(None, [previous] + asked))
+
+
+class Conversation:
+    __slots__ = ("turns", "chars", "summary", "last_active")
+
+    def __init__(self):
+        self.turns = deque()  # (role, text), role is "user" or "model"
+        self.chars = 0
+        self.summary = ""
+        self.last_active = time.monotonic()
+
+
+class ConversationStore:
+    def __init__(self, max_chars=3000, max_turns=16, idle_seconds=300, summarize=None):
+        self.max_chars = max_chars
+        self.max_turns = max_turns
+        self.idle_seconds = idle_seconds
+        # summarize(previous_summary, dropped_turns) -> new summary text
+        self.summarize = summarize
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.dropped_turns = 0
+        self.evicted_sessions = 0
+        self.last_prompt_chars = 0
+        self.max_prompt_chars = 0
+        self._total_prompt_chars = 0
+
+    def _get(self, session):
+        conv = self._sessions.get(session)
+        if conv is None:
+            conv = self._sessions[session] = Conversation()
+        return conv
+
+    def history(self, session):
+        # returns (summary, [(role, text), ...]) for the next request
+        with self._lock:
+            self._evict_idle()
+            conv = self._sessions.get(session)
+            if conv is None:
+                return "", []
+            conv.last_active = time.monotonic()
+            return conv.summary, list(conv.turns)
+
+    def record_prompt(self, chars):
+        with self._lock:
+            self.requests += 1
+            self.last_prompt_chars = chars
+            self.max_prompt_chars = max(self.max_prompt_chars, chars)
+            self._total_prompt_chars += chars
+
+    def add_turn(self, session, user_text, model_text):
+        # Gemini rejects empty text parts, one empty turn would fail every later request
+        if not user_text.strip() or not model_text.strip():
+            return
+        with self._lock:
+            conv = self._get(session)
+            for role, text in (("user", user_text), ("model", model_text)):
+                conv.turns.append((role, text))
+                conv.chars += len(text)
+            conv.last_active = time.monotonic()
+            self._trim(conv)
+
+    def _trim(self, conv):
+        dropped = []
+        # drop whole user/model pairs so the roles keep alternating
+        while conv.turns and (conv.chars > self.max_chars or len(conv.turns) > self.max_turns):
+            for _ in range(2):
+                if conv.turns:
+                    role, text = conv.turns.popleft()
+                    conv.chars -= len(text)
+                    dropped.append((role, text))
+        if dropped:
+            self.dropped_turns += len(dropped)
+            if self.summarize is not None:
+                conv.summary = self.summarize(conv.summary, dropped)[-(self.max_chars // 3):]
+
+    def reset(self, session):
+        with self._lock:
+            self._sessions.pop(session, None)
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_seconds
+        stale = [name for name, conv in self._sessions.items() if conv.last_active < cutoff]
+        for name in stale:
+            del self._sessions[name]
+        self.evicted_sessions += len(stale)
+
+    def evict_idle(self):
+        with self._lock:
+            self._evict_idle()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "turns": sum(len(c.turns) for c in self._sessions.values()),
+                "requests": self.requests,
+                "dropped_turns": self.dropped_turns,
+                "evicted_sessions": self.evicted_sessions,
+                "last_prompt_chars": self.last_prompt_chars,
+                "max_prompt_chars": self.max_prompt_chars,
+                "avg_prompt_chars": self._total_prompt_chars / self.requests if self.requests else 0.0,
+                "last_prompt_tokens": self.last_prompt_chars // CHARS_PER_TOKEN,
+            }
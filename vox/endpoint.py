@@ -0,0 +1,57 @@
+#ENDPOINT DETECTION
+#Decides when the user has finished talking from the trailing silence after the
+#last voiced block and from how long the partial transcript has stayed the same.
+
+from wake_word import EnergyGate
+
+STABLE = "stable"   # transcript hasn't changed for a while, safe to start the LLM early
+END = "end"         # enough trailing silence, utterance is over
+
+
+class EndpointDetector:
+    def __init__(self, samplerate, stable_ms=400, silence_ms=900, max_ms=15000, gate=None):
+        self.samplerate = samplerate
+        self.stable_ms = stable_ms
+        self.silence_ms = silence_ms
+        self.max_ms = max_ms
+        self.gate = gate or EnergyGate(samplerate, hangover_ms=0)
+        self.reset()
+
+    def reset(self):
+        self._text = ""
+        self._heard = False
+        self._silence_ms = 0.0
+        self._stable_ms = 0.0
+        self._total_ms = 0.0
+        self._stable_sent = False
+
+    def update(self, data, text):
+        # data is the int16 block just decoded, text the transcript so far (finals + partial)
+        block_ms = len(data) / 2 / self.samplerate * 1000
+        self._total_ms += block_ms
+        text = text.strip()
+
+        if self.gate.rms(data) >= self.gate.threshold:
+            self._silence_ms = 0.0
+        else:
+            self._silence_ms += block_ms
+
+        if text != self._text:
+            self._text = text
+            self._stable_ms = 0.0
+            self._stable_sent = False
+        else:
+            self._stable_ms += block_ms
+        if text:
+            self._heard = True
+
+        if self._total_ms >= self.max_ms and self._heard:
+            return END
+        if not self._heard:
+            return None
+        if self._silence_ms >= self.silence_ms:
+            return END
+        if not self._stable_sent and self._silence_ms > 0 and self._stable_ms >= self.stable_ms:
+            self._stable_sent = True
+            return STABLE
+        return None
@@ -0,0 +1,85 @@
+#GEMINI STREAMING
+#Cuts the streamed Gemini reply into sentences so speech can start as soon as
+#the first one is complete.
+
+import queue
+import re
+import threading
+from llm_client import LLMError
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+class SentenceSplitter:
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        parts = SENTENCE_END.split(self._buffer)
+        self._buffer = parts.pop()
+        return [p.strip() for p in parts if p and p.strip()]
+
+    def flush(self):
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+def stream_sentences(chunks):
+    splitter = SentenceSplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.flush()
+
+
+class StreamedReply:
+    # runs a chunk stream on its own thread and buffers finished sentences, so a
+    # reply can be started early and only consumed once the turn is confirmed
+    _DONE = object()
+
+    def __init__(self, chunks, cached=False):
+        self.text = ""
+        self.error = None
+        self.cached = cached
+        # False when the request leaned on earlier turns, so the reply mustn't be cached
+        self.standalone = True
+        # filled in by LLMRouter with the backend that answered
+        self.route = {}
+        # llm_request/llm_first_byte/llm_done timestamps, see tracing.traced_stream
+        self.marks = {}
+        self.cancelled = False
+        self._sentences = queue.Queue()
+        self._thread = threading.Thread(target=self._run, args=(chunks,), daemon=True)
+        self._thread.start()
+
+    def _run(self, chunks):
+        try:
+            for sentence in stream_sentences(chunks):
+                if self.cancelled:
+                    break
+                self.text = f"{self.text} {sentence}".strip()
+                self._sentences.put(sentence)
+        except LLMError as e:
+            # errors are spoken like before, but flagged so they never get cached
+            self.error = str(e)
+        except Exception as e:
+            self.error = f"Exception while calling Gemini: {e}"
+        finally:
+            if self.cancelled and hasattr(chunks, "close"):
+                # closes the upstream response instead of leaving it to the garbage collector
+                chunks.close()
+            if self.error:
+                self._sentences.put(self.error)
+            self._sentences.put(self._DONE)
+
+    def cancel(self):
+        # nobody wants the rest: sentences() ends now, the stream stops at its next sentence
+        self.cancelled = True
+        self._sentences.put(self._DONE)
+
+    def sentences(self):
+        while not self.cancelled:
+            sentence = self._sentences.get()
+            if sentence is self._DONE:
+                return
+            yield sentence
@@ -0,0 +1,93 @@
+#INPUTS
+#Anything that can start or stop a turn: terminal keys, global hotkeys, GPIO
+#buttons. Each source only posts an event (START or STOP plus its own name)
+#into the assistant's event queue; the state machine decides what it means.
+#The wake word is posted the same way by the decoder.
+#
+#TerminalKeys reads single key presses from the terminal and needs no special
+#privileges. HotkeyInput keeps the old system-wide 'q'/'s' hotkeys through the
+#keyboard module (root on Linux). GPIOButtons needs gpiozero.
+
+import os
+import sys
+import threading
+
+START = "start"
+STOP = "stop"
+DEFAULT_KEYS = {"s": START, "q": STOP}
+
+
+class TerminalKeys:
+    def __init__(self, post, keys=DEFAULT_KEYS, stream=None):
+        self.post = post
+        self.keys = keys
+        self.stream = stream or sys.stdin
+        self._saved = None
+
+    def start(self):
+        threading.Thread(target=self._run, name="terminal keys", daemon=True).start()
+
+    def _run(self):
+        fd = self.stream.fileno()
+        if self.stream.isatty():
+            import termios
+            import tty
+            # cbreak: one key at a time without Enter, Ctrl+C still interrupts
+            self._saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+            read = lambda: os.read(fd, 1).decode("utf-8", "ignore")
+        else:
+            read = self.stream.readline
+        while True:
+            text = read()
+            if not text:
+                return
+            for key in text.strip().lower():
+                if key in self.keys:
+                    self.post(self.keys[key], f"key {key}")
+
+    def close(self):
+        if self._saved is not None:
+            import termios
+            termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+
+class HotkeyInput:
+    def __init__(self, post, keys=DEFAULT_KEYS):
+        self.post = post
+        self.keys = keys
+        self._hotkeys = []
+
+    def start(self):
+        import keyboard
+        for key, event in self.keys.items():
+            self._hotkeys.append(keyboard.add_hotkey(key, self.post, args=(event, f"hotkey {key}")))
+
+    def close(self):
+        import keyboard
+        for hotkey in self._hotkeys:
+            keyboard.remove_hotkey(hotkey)
+        self._hotkeys = []
+
+
+class GPIOButtons:
+    def __init__(self, post, pins=None):
+        self.post = post
+        self.pins = pins or {17: START, 27: STOP}  # BCM numbering
+        self._buttons = []
+
+    def start(self):
+        from gpiozero import Button
+        for pin, event in self.pins.items():
+            button = Button(pin)
+            button.when_pressed = lambda event=event, pin=pin: self.post(event, f"gpio {pin}")
+            self._buttons.append(button)
+
+    def close(self):
+        for button in self._buttons:
+            button.close()
+        self._buttons = []
+
+
+INPUT_TYPES = {"terminal": TerminalKeys, "hotkeys": HotkeyInput, "gpio": GPIOButtons}
@@ -0,0 +1,210 @@
+#LOCAL INTENTS
+#Answers the everyday commands (time, date, pulse, volume) straight from the
+#Vosk transcript with precompiled patterns, so they never wait on the network.
+#Anything that doesn't match goes to the LLM as before. Transcripts are lower
+#case words without punctuation, so numbers arrive spelled out ("fifty").
+#A pattern has to match the whole utterance, give or take a leading or
+#trailing "aria"/"hey"/"please", so a question that merely contains "time" or
+#"louder" is still a question for the LLM.
+
+import datetime
+import re
+import threading
+import time
+from vitals_store import VITALS_PATH, VitalsStore
+
+FILLERS = r"(?:aria|hey|please)"
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60,
+    "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100,
+}
+NUMBER = r"(?:\d+|(?:%s)(?:[ -](?:%s))?)" % ("|".join(NUMBER_WORDS), "|".join(NUMBER_WORDS))
+
+
+def normalize(text):
+    return " ".join(re.sub(r"[^a-z0-9']+", " ", text.lower()).split())
+
+
+def words_to_number(text):
+    if text.isdigit():
+        return int(text)
+    return sum(NUMBER_WORDS[word] for word in re.split(r"[ -]", text))
+
+
+def spoken_time(now):
+    # same clock the dashboard shows ("hh:mm AP"), without the leading zero
+    return now.strftime("%I:%M %p").lstrip("0")
+
+
+def spoken_date(now):
+    return f"{now.strftime('%A, %B')} {now.day}"
+
+
+def read_pulse_history(path=VITALS_PATH, limit=10):
+    # newest readings written by PulseScreen, read from the memory-mapped store
+    records = VitalsStore(path, "pulse", writable=False).tail(limit)
+    return [(datetime.datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S"), round(bpm))
+            for t, bpm in records.tolist()]
+
+
+def read_pulse_summary(since, path=VITALS_PATH):
+    # (min, max, average, count) of the readings since an epoch time, from the rollups
+    level = "hour" if time.time() - since > 6 * 3600 else "minute"
+    return VitalsStore(path, "pulse", writable=False).summary(since, level=level)
+
+
+class VolumeControl:
+    def __init__(self, level=1.0, step=0.2):
+        self.level = level
+        self.step = step
+        self._unmuted = level
+
+    def set(self, level):
+        self.level = min(1.0, max(0.0, level))
+        if self.level:
+            self._unmuted = self.level
+        return self.level
+
+    def up(self):
+        return self.set(self.level + self.step)
+
+    def down(self):
+        return self.set(self.level - self.step)
+
+    def mute(self):
+        self.level = 0.0
+        return self.level
+
+    def unmute(self):
+        return self.set(self._unmuted or self.step)
+
+
+class Intent:
+    __slots__ = ("name", "pattern", "handler")
+
+    def __init__(self, name, patterns, handler):
+        self.name = name
+        alternatives = "|".join(f"(?:{p})" for p in patterns)
+        self.pattern = re.compile(rf"(?:{FILLERS} )*(?:{alternatives})(?: {FILLERS})*")
+        self.handler = handler  # handler(match) -> reply text
+
+
+class IntentMatcher:
+    def __init__(self, intents=()):
+        self.intents = list(intents)
+        self._lock = threading.Lock()
+        self.matched = {}
+        self.misses = 0
+        self.max_ms = 0.0
+
+    def add(self, name, patterns, handler):
+        self.intents.append(Intent(name, patterns, handler))
+
+    def find(self, text):
+        # (intent, match) without running the handler, None when the LLM should answer
+        text = normalize(text)
+        for intent in self.intents:
+            match = intent.pattern.fullmatch(text)
+            if match:
+                return intent, match
+        return None
+
+    def answer(self, text):
+        # (intent name, reply) or None
+        start = time.perf_counter()
+        found = self.find(text)
+        reply = found[0].handler(found[1]) if found else None
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.max_ms = max(self.max_ms, elapsed)
+            if found:
+                self.matched[found[0].name] = self.matched.get(found[0].name, 0) + 1
+            else:
+                self.misses += 1
+        return (found[0].name, reply) if found else None
+
+    def stats(self):
+        with self._lock:
+            return {"matched": dict(self.matched), "misses": self.misses, "max_ms": self.max_ms}
+
+
+def local_intents(volume=None, pulse_history=read_pulse_history, now=datetime.datetime.now,
+                  pulse_summary=read_pulse_summary):
+    matcher = IntentMatcher()
+
+    matcher.add("time", [
+        r"what(?:'s| is)? (?:the )?time(?: is it)?(?: now| right now)?",
+        r"what time is it(?: now| right now)?",
+        r"(?:can you |could you )?tell me (?:the time|what time it is)",
+    ], lambda m: f"It's {spoken_time(now())}.")
+
+    matcher.add("date", [
+        r"what(?:'s| is)? (?:the |today's )?date(?: today)?",
+        r"what day is (?:it|today)(?: today)?",
+        r"what(?:'s| is) today",
+    ], lambda m: f"Today is {spoken_date(now())}.")
+
+    def pulse_range(m):
+        span = m["span"]
+        if span == "today":
+            since = now().replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            since = now() - datetime.timedelta(seconds={"hour": 3600, "day": 86400, "week": 7 * 86400}[span.split()[-1]])
+        summary = pulse_summary(since.timestamp())
+        period = span if span in ("today", "this week") else f"the {span}"
+        if not summary:
+            return f"I don't have any pulse readings from {period}."
+        low, high, average, _ = summary
+        lead = period.capitalize() if period == span else f"Over {period}"
+        return (f"{lead} your pulse ranged from {low:.0f} to {high:.0f} beats per minute, "
+                f"averaging {average:.0f}.")
+
+    # before "pulse", which would also match "how is my heart rate today"
+    matcher.add("pulse_range", [
+        r"(?:what|how)(?:'s| is| was| has)? my (?:pulse|heart ?rate)(?: been)? (?:(?:over|in|for|during) )?(?:the )?"
+        r"(?P<span>(?:last|past) (?:hour|day|week)|this week|today)",
+    ], pulse_range)
+
+    def pulse(m):
+        history = pulse_history()
+        if not history:
+            return "I don't have a pulse reading yet. Open the pulse monitor first."
+        _, bpm = history[-1]
+        average = sum(b for _, b in history) / len(history)
+        return (f"Your pulse is {bpm} beats per minute. "
+                f"The last {len(history)} readings average {average:.0f}.")
+
+    matcher.add("pulse", [
+        r"what(?:'s| is)? my (?:pulse|heart ?rate|bpm)(?: now| right now)?",
+        r"how(?:'s| is) my (?:pulse|heart ?rate|heart)(?: doing)?",
+        r"(?:check|read|tell me) my (?:pulse|heart ?rate)",
+    ], pulse)
+
+    if volume is not None:
+        matcher.add("volume_set", [
+            rf"(?:set )?(?:the )?volume (?:to )?(?P<level>{NUMBER})(?: percent)?",
+        ], lambda m: f"Volume set to {round(volume.set(words_to_number(m['level']) / 100) * 100)} percent.")
+        matcher.add("volume_up", [
+            r"(?:the )?volume up|turn (?:it |the volume )?up|turn up the volume|speak up",
+        ], lambda m: f"Volume up, {round(volume.up() * 100)} percent.")
+        matcher.add("volume_down", [
+            r"(?:the )?volume down|turn (?:it |the volume )?down|turn down the volume|speak (?:more )?(?:softly|quietly)",
+        ], lambda m: f"Volume down, {round(volume.down() * 100)} percent.")
+
+        def unmute(m):
+            volume.unmute()
+            return "Sound is back on."
+
+        def mute(m):
+            # nothing to say, it wouldn't be heard anyway
+            volume.mute()
+            return ""
+
+        matcher.add("unmute", [r"unmute (?:yourself|the sound|the volume)|turn the sound (?:back )?on"], unmute)
+        matcher.add("mute", [r"mute (?:yourself|the sound|the volume)|be quiet"], mute)
+
+    return matcher
@@ -0,0 +1,245 @@
+#LLM BACKENDS
+#Every backend takes the same Gemini-style request dict ({"contents": [...]})
+#and offers generate(data) -> text and stream(data) -> text chunks:
+#
+#   GeminiBackend             the Gemini REST API (LLMClient)
+#   OpenAICompatibleBackend   any local /v1/chat/completions server (llama.cpp, Ollama, vLLM, ...)
+#   RuleBackend               in-process regex rules, works with no network at all
+#   FakeBackend               deterministic replies with fixed timing, for benchmarks
+#
+#LLMRouter picks a backend per request: the first one in preference order that
+#is up and whose measured latency fits the budget, failing over to the next
+#one if a request fails before producing any text. Fallback backends (the
+#rules) are only used once every real model is down or has failed. A backend
+#that was too slow gets another try once its measurement is stale.
+
+import json
+import re
+import threading
+import time
+from llm_client import LLMClient, LLMError
+
+
+def last_user_text(data):
+    return data["contents"][-1]["parts"][-1]["text"]
+
+
+class GeminiBackend(LLMClient):
+    name = "gemini"
+    cacheable = True
+
+
+class OpenAICompatibleBackend(LLMClient):
+    name = "local"
+    cacheable = True
+
+    def __init__(self, base_url="http://localhost:8080/v1", model="local", api_key=None, **kwargs):
+        super().__init__(base_url=base_url, model=model, **kwargs)
+        self.session.headers.pop("x-goog-api-key", None)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def url(self, method):
+        return f"{self.base_url}/chat/completions"
+
+    def _messages(self, data):
+        messages = []
+        system = data.get("systemInstruction")
+        if system:
+            messages.append({"role": "system", "content": "\n".join(p["text"] for p in system["parts"])})
+        for turn in data["contents"]:
+            role = "assistant" if turn.get("role") == "model" else "user"
+            messages.append({"role": role, "content": "\n".join(p["text"] for p in turn["parts"])})
+        return messages
+
+    def _body(self, data, stream=False):
+        body = {"model": self.model, "messages": self._messages(data)}
+        config = data.get("generationConfig", {})
+        if "maxOutputTokens" in config:
+            body["max_tokens"] = config["maxOutputTokens"]
+        if "temperature" in config:
+            body["temperature"] = config["temperature"]
+        if stream:
+            body["stream"] = True
+        return body
+
+    def generate(self, data):
+        body = self._body(data)
+        response = self._post("chat", body)
+        return response.json()["choices"][0]["message"]["content"]
+
+    def stream(self, data):
+        body = self._body(data, stream=True)
+        response = self._post("chat", body, stream=True)
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                for choice in json.loads(payload).get("choices", []):
+                    text = choice.get("delta", {}).get("content")
+                    if text:
+                        yield text
+
+
+DEFAULT_RULES = [
+    (r"\b(hello|hi|hey|good (morning|afternoon|evening))\b", "Hello, sire! How can I help?"),
+    (r"\b(thank you|thanks)\b", "You're welcome, sire."),
+    (r"\bwho are you\b|\byour name\b", "I'm Aria, your personal assistant."),
+    (r"\bhow are you\b", "I'm doing well, thank you for asking."),
+]
+
+
+class RuleBackend:
+    # regex -> reply (a string or a function of the match); never needs the network
+    name = "rules"
+    # canned offline answers must not shadow a real reply in the response cache
+    cacheable = False
+    fallback = True
+
+    def __init__(self, rules=DEFAULT_RULES, fallback_reply="Sorry sire, I can't reach my online brain right now."):
+        self.rules = [(re.compile(pattern, re.IGNORECASE), reply) for pattern, reply in rules]
+        self.fallback_reply = fallback_reply
+
+    def generate(self, data):
+        text = last_user_text(data)
+        for pattern, reply in self.rules:
+            match = pattern.search(text)
+            if match:
+                return reply(match) if callable(reply) else reply
+        return self.fallback_reply
+
+    def stream(self, data):
+        yield self.generate(data)
+
+    def close(self):
+        pass
+
+
+class FakeBackend:
+    # deterministic stand-in: fixed chunks, fixed delays, optional failures
+    name = "fake"
+    cacheable = True
+
+    def __init__(self, chunks=None, first_delay=0.0, chunk_delay=0.0, fail=False, name=None):
+        self.chunks = chunks
+        self.first_delay = first_delay
+        self.chunk_delay = chunk_delay
+        self.fail = fail
+        self.calls = 0
+        if name:
+            self.name = name
+
+    def _chunks(self, data):
+        if self.chunks is not None:
+            return list(self.chunks)
+        return [f"You said: {last_user_text(data)}."]
+
+    def generate(self, data):
+        return "".join(self.stream(data))
+
+    def stream(self, data):
+        self.calls += 1
+        time.sleep(self.first_delay)
+        if self.fail:
+            raise LLMError(503, f"{self.name} backend unavailable")
+        for i, chunk in enumerate(self._chunks(data)):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield chunk
+
+    def close(self):
+        pass
+
+
+class BackendStats:
+    __slots__ = ("latency", "measured_at", "requests", "failures", "down_until")
+
+    def __init__(self):
+        self.latency = None  # EWMA seconds to first chunk
+        self.measured_at = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+
+class LLMRouter:
+    def __init__(self, backends, latency_budget=2.5, cooldown=30.0, remeasure=120.0, alpha=0.3):
+        self.backends = list(backends)
+        self.latency_budget = latency_budget
+        self.cooldown = cooldown
+        self.remeasure = remeasure
+        self.alpha = alpha
+        self._stats = {id(b): BackendStats() for b in self.backends}
+        self._lock = threading.Lock()
+
+    def _fits(self, backend, now):
+        stats = self._stats[id(backend)]
+        return (stats.latency is None or stats.latency <= self.latency_budget
+                or now - stats.measured_at > self.remeasure)
+
+    def order(self):
+        # backends within budget in preference order, then slow ones fastest first,
+        # then backends that are cooling down after a failure, fallbacks always last
+        now = time.monotonic()
+        primary = [b for b in self.backends if not getattr(b, "fallback", False)]
+        up = [b for b in primary if self._stats[id(b)].down_until <= now]
+        fits = [b for b in up if self._fits(b, now)]
+        slow = sorted((b for b in up if b not in fits), key=lambda b: self._stats[id(b)].latency)
+        down = [b for b in primary if b not in up]
+        return fits + slow + [b for b in self.backends if b not in primary] + down
+
+    def _record(self, backend, latency=None, failed=False):
+        with self._lock:
+            stats = self._stats[id(backend)]
+            stats.requests += 1
+            if failed:
+                stats.failures += 1
+                stats.down_until = time.monotonic() + self.cooldown
+            elif latency is not None:
+                stale = stats.latency is None or time.monotonic() - stats.measured_at > self.remeasure
+                stats.latency = latency if stale else self.alpha * latency + (1 - self.alpha) * stats.latency
+                stats.measured_at = time.monotonic()
+
+    def stream(self, data, route=None):
+        # route, if given, is filled in with the backend that answered
+        error = None
+        for backend in self.order():
+            if route is not None:
+                route["backend"] = backend.name
+                route["cacheable"] = getattr(backend, "cacheable", True)
+            start = time.perf_counter()
+            produced = False
+            try:
+                for chunk in backend.stream(data):
+                    if not produced:
+                        produced = True
+                        self._record(backend, time.perf_counter() - start)
+                    yield chunk
+                if not produced:
+                    self._record(backend, time.perf_counter() - start)
+                return
+            except Exception as e:
+                self._record(backend, failed=True)
+                if produced:
+                    # half a reply was already spoken, switching backends now would be worse
+                    raise
+                print(f"LLM backend {backend.name} failed, trying the next one: {e}")
+                error = e
+        raise error or LLMError(503, "no LLM backend available")
+
+    def generate(self, data, route=None):
+        return "".join(self.stream(data, route))
+
+    def stats(self):
+        with self._lock:
+            return {b.name: {"latency": self._stats[id(b)].latency, "requests": self._stats[id(b)].requests,
+                             "failures": self._stats[id(b)].failures,
+                             "up": self._stats[id(b)].down_until <= time.monotonic()}
+                    for b in self.backends}
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
@@ -0,0 +1,151 @@
+#LLM CLIENT
+#One long-lived HTTP session for the Gemini REST API: pooled keep-alive
+#connections, connect/read timeouts and a few retries with jittered backoff.
+#AsyncLLMClient wraps the same client for asyncio code.
+
+import asyncio
+import json
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+GEMINI_MODEL = "gemini-2.0-flash"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def iter_sse_text(response):
+    # each SSE event is one "data: {json}" line holding a partial GenerateContentResponse
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            break
+        event = json.loads(payload)
+        for candidate in event.get("candidates", []):
+            for part in candidate.get("content", {}).get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
+
+
+class LLMError(Exception):
+    def __init__(self, status, text):
+        super().__init__(f"Error {status}: {text}")
+        self.status = status
+        self.text = text
+
+
+class LLMClient:
+    def __init__(self, api_key=None, base_url=GEMINI_BASE_URL, model=GEMINI_MODEL,
+                 connect_timeout=3.05, read_timeout=20, retries=2, backoff=0.25, pool_size=4):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        # retries are done by hand below so streaming and jitter behave the same way
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        if api_key:
+            self.session.headers["x-goog-api-key"] = api_key
+
+    def url(self, method):
+        return f"{self.base_url}/models/{self.model}:{method}"
+
+    def _sleep_before_retry(self, attempt):
+        # full jitter: anywhere between 0 and the exponential cap
+        time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    def _post(self, method, data, stream=False, params=None):
+        attempt = 0
+        while True:
+            try:
+                # requests from RequestBuilder arrive already encoded
+                body = getattr(data, "body", None)
+                response = self.session.post(self.url(method), data=body, json=None if body else data,
+                                             params=params, stream=stream, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            else:
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    error = LLMError(response.status_code, response.text)
+                    response.close()
+                    raise error
+                response.close()
+            self._sleep_before_retry(attempt)
+            attempt += 1
+
+    def generate(self, data):
+        response = self._post("generateContent", data)
+        content = response.json()
+        return content['candidates'][0]['content']['parts'][0]['text']
+
+    def stream(self, data):
+        # only the request itself is retried, never a stream that already produced text
+        response = self._post("streamGenerateContent", data, stream=True, params={"alt": "sse"})
+        with response:
+            yield from iter_sse_text(response)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncLLMClient:
+    # the blocking calls run on worker threads, the event loop stays free meanwhile
+    _DONE = object()
+
+    def __init__(self, client=None, **kwargs):
+        self.client = client or LLMClient(**kwargs)
+
+    async def generate(self, data):
+        return await asyncio.to_thread(self.client.generate, data)
+
+    async def stream(self, data):
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        stopped = threading.Event()
+
+        def post(item):
+            if not stopped.is_set():
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+
+        def pump():
+            upstream = self.client.stream(data)
+            try:
+                for chunk in upstream:
+                    if stopped.is_set():
+                        break
+                    post(chunk)
+            except Exception as e:
+                post(e)
+            finally:
+                # closes the HTTP response as soon as the consumer is gone instead of reading it to the end
+                if hasattr(upstream, "close"):
+                    upstream.close()
+                post(self._DONE)
+
+        loop.run_in_executor(None, pump)
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is self._DONE:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            # a consumer that stops early (a client hung up) doesn't wait for the rest of the reply
+            stopped.set()
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,82 @@
+#MOCK GEMINI SERVER
+#Local stand-in for the Gemini REST API used by the benchmarks. Serves both
+#generateContent (whole reply at once) and streamGenerateContent?alt=sse
+#(one SSE event per chunk), with a configurable delay per chunk to imitate
+#token generation time.
+#
+#   server, base_url = start_mock_server(["Hello there. ", "How can I help?"], chunk_delay=0.2)
+#   ... requests against f"{base_url}/models/gemini-2.0-flash:streamGenerateContent?alt=sse"
+#   server.shutdown()
+#
+#fail_first makes the first N requests answer 503, to exercise client retries.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CHUNKS = [
+    "Good morning, sire. ",
+    "The weather today looks clear and mild, ",
+    "so a light jacket should do. ",
+    "Anything else I can help with?",
+]
+
+
+def _response_json(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.requests.append((self.path, json.loads(body or b"{}")))
+        if len(self.server.requests) <= self.server.fail_first:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        chunks = self.server.chunks
+        delay = self.server.chunk_delay
+
+        if ":streamGenerateContent" in self.path:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in chunks:
+                time.sleep(delay)
+                event = f"data: {json.dumps(_response_json(chunk))}\r\n\r\n".encode()
+                self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        elif ":generateContent" in self.path:
+            time.sleep(delay * len(chunks))
+            payload = json.dumps(_response_json("".join(chunks))).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+
+def start_mock_server(chunks=None, chunk_delay=0.1, fail_first=0, host="127.0.0.1", port=0):
+    server = ThreadingHTTPServer((host, port), MockGeminiHandler)
+    server.daemon_threads = True
+    server.chunks = list(chunks or DEFAULT_CHUNKS)
+    server.chunk_delay = chunk_delay
+    server.fail_first = fail_first
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1beta"
@@ -0,0 +1,85 @@
+#REQUEST BUILDER
+#Builds generateContent bodies from configuration that doesn't change between
+#turns (system prompt, generation limits, safety settings). That part is JSON
+#encoded once at startup; per turn only the conversation contents are encoded
+#and spliced in, with recently seen history turns reused from a small cache.
+#
+#The result is still a dict (the other LLM backends read "contents" from it)
+#with the finished bytes in .body, which LLMClient sends as is.
+
+import json
+import os
+from functools import lru_cache
+
+API_KEY_ENV = "GEMINI_API_KEY"
+API_KEY_FILE = "~/.config/vox/gemini_api_key"
+
+SAFETY_CATEGORIES = (
+    "HARM_CATEGORY_HARASSMENT",
+    "HARM_CATEGORY_HATE_SPEECH",
+    "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+    "HARM_CATEGORY_DANGEROUS_CONTENT",
+)
+
+
+def load_api_key(env=API_KEY_ENV, path=API_KEY_FILE):
+    # environment first, then a key file readable only by the user; None if neither is set
+    key = os.environ.get(env)
+    if key:
+        return key.strip()
+    try:
+        with open(os.path.expanduser(path)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _encode(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@lru_cache(maxsize=64)
+def _encode_turn(role, text):
+    # history turns come back on every request until they are trimmed
+    return _encode({"role": role, "parts": [{"text": text}]})
+
+
+class GeminiRequest(dict):
+    body = b""
+
+
+class RequestBuilder:
+    def __init__(self, system_prompt, max_output_tokens=150, temperature=0.7, top_p=None,
+                 safety_threshold="BLOCK_ONLY_HIGH", summary_prefix="Earlier in this conversation the user asked about: "):
+        generation = {"maxOutputTokens": max_output_tokens, "temperature": temperature}
+        if top_p is not None:
+            generation["topP"] = top_p
+        self.static = {
+            "systemInstruction": {"parts": [{"text": system_prompt}]},
+            "generationConfig": generation,
+            "safetySettings": [{"category": c, "threshold": safety_threshold} for c in SAFETY_CATEGORIES],
+        }
+        self.summary_prefix = summary_prefix
+        self.system_chars = len(system_prompt)
+        # everything up to the contents array, encoded once
+        self._head = _encode(self.static)[:-1] + b',"contents":['
+        # identifies the configuration, e.g. for response cache keys
+        self.fingerprint = _encode(self.static).decode("utf-8")
+
+    def build(self, user_input, history=(), summary=""):
+        # history is [(role, text), ...] with earlier turns first, so follow-ups have context
+        parts = []
+        if summary:
+            parts.append({"text": self.summary_prefix + summary})
+        parts.append({"text": user_input})
+        current = {"role": "user", "parts": parts}
+
+        data = GeminiRequest(self.static)
+        data["contents"] = [{"role": role, "parts": [{"text": text}]} for role, text in history] + [current]
+        encoded = [_encode_turn(role, text) for role, text in history]
+        encoded.append(_encode(current))
+        data.body = self._head + b",".join(encoded) + b"]}"
+        return data
+
+    def prompt_chars(self, data):
+        return self.system_chars + sum(len(p["text"]) for turn in data["contents"] for p in turn["parts"])
@@ -0,0 +1,52 @@
+#RESAMPLING
+#Streaming polyphase resampler for int16 mono audio, so the mic can run at
+#whatever rate the device supports (44.1/48 kHz on most USB mics) while Vosk
+#always gets 16 kHz. The filter is a windowed sinc split into up phases; each
+#block is filtered with one vectorized gather + dot product and the filter
+#history is carried across blocks, so block edges don't click.
+
+from math import gcd
+import numpy as np
+
+
+class Resampler:
+    def __init__(self, src_rate, dst_rate, taps_per_phase=16):
+        g = gcd(int(src_rate), int(dst_rate))
+        self.up = int(dst_rate) // g
+        self.down = int(src_rate) // g
+        self.passthrough = self.up == self.down
+        if self.passthrough:
+            return
+
+        taps = taps_per_phase * self.up
+        cutoff = 1.0 / max(self.up, self.down)
+        n = np.arange(taps) - (taps - 1) / 2
+        h = np.sinc(cutoff * n) * cutoff * np.hamming(taps) * self.up
+        # phases[p, j] = h[p + j * up]
+        self.phases = h.reshape(taps_per_phase, self.up).T.astype(np.float32)
+        self.taps_per_phase = taps_per_phase
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        # position of the next output sample in the upsampled domain, relative to the history start
+        self._pos = (taps_per_phase - 1) * self.up
+        self._offsets = np.arange(taps_per_phase)
+
+    def process(self, data):
+        # data: int16 bytes/buffer at src_rate, returns int16 bytes at dst_rate
+        if self.passthrough:
+            return bytes(data)
+        x = np.concatenate((self._history, np.frombuffer(data, dtype=np.int16).astype(np.float32)))
+        end = len(x) * self.up
+        n = np.arange(self._pos, end, self.down)
+        if n.size:
+            base = n // self.up
+            phase = n % self.up
+            windows = x[base[:, None] - self._offsets[None, :]]
+            y = np.einsum("mj,mj->m", self.phases[phase], windows)
+            self._pos = int(n[-1]) + self.down
+        else:
+            y = np.zeros(0, dtype=np.float32)
+        keep = self.taps_per_phase - 1
+        consumed = len(x) - keep
+        self._history = x[consumed:]
+        self._pos -= consumed * self.up
+        return np.clip(np.rint(y), -32768, 32767).astype(np.int16).tobytes()
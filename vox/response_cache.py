@@ -0,0 +1,167 @@
+#RESPONSE CACHE
+#Persistent SQLite cache in front of the LLM, keyed on the normalized transcript
+#and the system prompt. Entries expire after a TTL, the table is trimmed to
+#max_entries by least-recent use, and an optional fuzzy tier (off by default)
+#lets near-identical utterances hit as well. For the fuzzy tier a leading
+#"what is", "tell me", "can you tell me", "do you know" and the like all read
+#as the same question, and beyond that a match may only differ in stopwords,
+#never in a content word, number or unit.
+#
+#   cache = ResponseCache(":memory:", fuzzy_threshold=0.5)
+#   cache.put("what's the capital of france", prompt, "Paris.")
+#   cache.get("tell me the capital of france", prompt)     # "Paris.", fuzzy hit
+#   cache.get("what's the capital of spain", prompt)       # None, content word differs
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+FILLER_WORDS = {"aria", "please", "um", "uh", "hey", "okay", "ok", "so"}
+CONTRACTIONS = {"what's": "what is", "it's": "it is", "who's": "who is", "where's": "where is",
+                "how's": "how is", "that's": "that is", "i'm": "i am", "don't": "do not"}
+# words that can differ between a question and a fuzzy match without changing what is asked
+STOPWORDS = {"a", "an", "the", "is", "are", "was", "were", "be", "do", "does", "did", "can", "could",
+             "would", "will", "you", "me", "tell", "i", "to", "of", "for", "in", "on", "at", "it", "that",
+             "this", "there", "know", "want", "like", "just", "really"}
+# ways of starting the same question, all compared as "ask ..." by the fuzzy tier
+QUESTION_LEAD = re.compile(r"^(?:(?:(?:can|could|would) you )?(?:tell me|do you know)(?: what (?:is|are))?|what (?:is|are))\b")
+# answers that go stale quickly get a much shorter TTL
+VOLATILE = re.compile(r"\b(time|today|tonight|now|date|day|weather|news|latest|current)\b")
+
+
+def normalize(text):
+    text = text.lower()
+    for short, full in CONTRACTIONS.items():
+        text = text.replace(short, full)
+    words = re.findall(r"[a-z0-9']+", text)
+    return " ".join(w for w in words if w not in FILLER_WORDS)
+
+
+def _fuzzy_words(query):
+    # a statement or yes/no question keeps its own words, so it never meets an "ask ..." form
+    return set(QUESTION_LEAD.sub("ask", query).split())
+
+
+def _hash(*parts):
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path, ttl=24 * 3600, volatile_ttl=60, max_entries=500,
+                 fuzzy_threshold=None, fuzzy_candidates=200):
+        self.path = path
+        self.ttl = ttl
+        self.volatile_ttl = volatile_ttl
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold  # e.g. 0.8 turns the fuzzy tier on
+        self.fuzzy_candidates = fuzzy_candidates
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, prompt TEXT NOT NULL, query TEXT NOT NULL,"
+            " response TEXT NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (prompt, last_used)")
+        self._db.commit()
+
+    def _ttl_for(self, query):
+        return self.volatile_ttl if VOLATILE.search(query) else self.ttl
+
+    def get(self, transcript, system_prompt):
+        query = normalize(transcript)
+        if not query:
+            return None
+        prompt = _hash(system_prompt)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, expires FROM responses WHERE key = ?", (_hash(prompt, query),)
+            ).fetchone()
+            if row and row[1] > now:
+                self._touch(_hash(prompt, query), now)
+                self.hits += 1
+                return row[0]
+            if self.fuzzy_threshold:
+                match = self._fuzzy(prompt, query, now)
+                if match:
+                    self.fuzzy_hits += 1
+                    return match
+            self.misses += 1
+            return None
+
+    def _fuzzy(self, prompt, query, now):
+        words = _fuzzy_words(query)
+        best, best_score = None, self.fuzzy_threshold
+        rows = self._db.execute(
+            "SELECT key, query, response FROM responses WHERE prompt = ? AND expires > ?"
+            " ORDER BY last_used DESC LIMIT ?", (prompt, now, self.fuzzy_candidates)
+        )
+        for key, other, response in rows:
+            other_words = _fuzzy_words(other)
+            if not (words ^ other_words) <= STOPWORDS:
+                continue
+            score = len(words & other_words) / len(words | other_words)
+            if score >= best_score:
+                best, best_score = (key, response), score
+        if best is None:
+            return None
+        self._touch(best[0], now)
+        return best[1]
+
+    def _touch(self, key, now):
+        self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self._db.commit()
+
+    def put(self, transcript, system_prompt, response):
+        query = normalize(transcript)
+        if not query or not response:
+            return
+        prompt = _hash(system_prompt)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (_hash(prompt, query), prompt, query, response, now + self._ttl_for(query), now),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now):
+        expired = self._db.execute("DELETE FROM responses WHERE expires <= ?", (now,)).rowcount
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)", (overflow,)
+            )
+        self.evictions += expired + max(overflow, 0)
+
+    def stats(self):
+        with self._lock:
+            (size,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        lookups = self.hits + self.fuzzy_hits + self.misses
+        return {
+            "size": size,
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.fuzzy_hits) / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
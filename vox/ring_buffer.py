@@ -0,0 +1,84 @@
+#AUDIO RING BUFFER
+#Fixed-size, preallocated byte ring between the sounddevice callback and the
+#decoder. The callback only copies into the ring (no new objects per block);
+#when the reader falls behind the oldest audio is dropped and counted as an
+#overrun instead of letting memory and latency grow.
+
+import threading
+import time
+
+
+class AudioRingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        # absolute byte counters, positions in the ring are counter % capacity
+        self._written = 0
+        self._read = 0
+        self.overruns = 0
+        self.dropped_bytes = 0
+        self.peak_fill = 0
+        # perf_counter() of the latest write, lets the reader estimate how long audio sat here
+        self.last_write = 0.0
+        self._cond = threading.Condition()
+
+    def write(self, data):
+        src = memoryview(data).cast("B")
+        n = len(src)
+        if n > self.capacity:
+            src = src[n - self.capacity:]
+            n = self.capacity
+        with self._cond:
+            free = self.capacity - (self._written - self._read)
+            if n > free:
+                # drop oldest
+                self._read += n - free
+                self.overruns += 1
+                self.dropped_bytes += n - free
+            start = self._written % self.capacity
+            first = min(n, self.capacity - start)
+            self._view[start:start + first] = src[:first]
+            if first < n:
+                self._view[:n - first] = src[first:]
+            self._written += n
+            self.last_write = time.perf_counter()
+            self.peak_fill = max(self.peak_fill, self._written - self._read)
+            self._cond.notify()
+
+    def read_into(self, out, timeout=None):
+        # blocks until len(out) bytes are buffered, copies them into the caller's
+        # preallocated buffer and returns a view of it; None on timeout
+        n = len(out)
+        dst = memoryview(out)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._written - self._read >= n, timeout):
+                return None
+            start = self._read % self.capacity
+            first = min(n, self.capacity - start)
+            dst[:first] = self._view[start:start + first]
+            if first < n:
+                dst[first:n] = self._view[:n - first]
+            self._read += n
+        return dst
+
+    def clear(self):
+        with self._cond:
+            self._read = self._written
+
+    def fill(self):
+        with self._cond:
+            return self._written - self._read
+
+    def fill_level(self):
+        return self.fill() / self.capacity
+
+    def stats(self):
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "fill": self._written - self._read,
+                "peak_fill": self.peak_fill,
+                "overruns": self.overruns,
+                "dropped_bytes": self.dropped_bytes,
+            }
@@ -0,0 +1,54 @@
+#SPEECH OUTPUT
+#Single worker thread that speaks queued sentences in order, so callers only
+#enqueue text and never wait on the TTS engine themselves. cancel() drops
+#everything queued and interrupts the sentence being played (barge-in).
+
+import queue
+import threading
+
+
+class SpeechWorker:
+    def __init__(self, speak_fn, stop_fn=None):
+        self.speak_fn = speak_fn
+        self.stop_fn = stop_fn
+        self.jobs = queue.Queue()
+        # bumped by cancel(); jobs queued under an older generation are skipped
+        self.generation = 0
+        self.speaking = threading.Event()
+        self.current = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def say(self, text, generation=None, trace=None):
+        # trace (a TurnTrace) gets tts_start/tts_end marks when the sentence is actually played
+        self.jobs.put((self.generation if generation is None else generation, text, trace))
+
+    def busy(self):
+        return self.jobs.unfinished_tasks > 0
+
+    def wait(self):
+        self.jobs.join()
+
+    def cancel(self):
+        self.generation += 1
+        if self.speaking.is_set() and self.stop_fn:
+            self.stop_fn()
+
+    def _run(self):
+        while True:
+            generation, text, trace = self.jobs.get()
+            try:
+                if generation == self.generation:
+                    self.current = text
+                    self.speaking.set()
+                    if trace is not None:
+                        trace.mark_once("tts_start")
+                    self.speak_fn(text)
+                    if trace is not None:
+                        trace.mark("tts_end")
+            except Exception as e:
+                print(f"Speech error: {e}")
+            finally:
+                self.speaking.clear()
+                self.current = None
+                self.jobs.task_done()
@@ -0,0 +1,54 @@
+#TRACE SUMMARY
+#Reads the JSONL turn traces written by the assistant (cache/traces.jsonl by
+#default) and prints p50/p95/p99 per span, so a slow turn can be pinned on a
+#stage: audio queue, wake word, LLM, or speech.
+#
+#   python vox/trace_summary.py cache/traces.jsonl --last 500
+
+import argparse
+import json
+from tracing import SPANS
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def load(paths, last=None):
+    records = []
+    for path in paths:
+        with open(path) as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records[-last:] if last else records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency percentiles from turn traces")
+    parser.add_argument("traces", nargs="*", default=["cache/traces.jsonl"])
+    parser.add_argument("--last", type=int, default=None, help="only the most recent N turns")
+    parser.add_argument("--include-cancelled", action="store_true", help="count turns cut short by barge-in")
+    args = parser.parse_args()
+
+    records = load(args.traces, args.last)
+    cancelled = sum(1 for r in records if r["cancelled"])
+    if not args.include_cancelled:
+        records = [r for r in records if not r["cancelled"]]
+    print(f"{len(records)} turns ({cancelled} cancelled)\n")
+    print(f"{'span':<24} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, _, _ in SPANS:
+        values = sorted(r["spans_ms"][name] for r in records if name in r["spans_ms"])
+        if not values:
+            print(f"{name:<24} {0:>6} {'-':>9} {'-':>9} {'-':>9} {'-':>9}")
+            continue
+        print(f"{name:<24} {len(values):>6} {percentile(values, 0.5):>9.1f} {percentile(values, 0.95):>9.1f} "
+              f"{percentile(values, 0.99):>9.1f} {values[-1]:>9.1f}")
+
+    for key, label in (("decoder_cpu_ms", "decoder cpu ms/turn"), ("queue_depth_max", "queue depth bytes")):
+        values = sorted(r[key] for r in records)
+        if values:
+            print(f"{label:<24} {len(values):>6} {percentile(values, 0.5):>9.1f} {percentile(values, 0.95):>9.1f} "
+                  f"{percentile(values, 0.99):>9.1f} {values[-1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
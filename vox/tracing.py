@@ -0,0 +1,202 @@
+#TURN TRACING
+#Records a monotonic timestamp (time.perf_counter) for every stage of a turn:
+#
+#   block_enqueue   the audio block that triggered the turn reached the ring
+#   block_dequeue   the decoder picked that block up
+#   wake            wake word (or 's') started the turn
+#   speech_start    VAD heard the user start talking      speech_end   ...and stop
+#   endpoint        end of speech (or 'q')
+#   llm_request     request sent        llm_first_byte   first text back
+#   llm_done        reply complete
+#   tts_start       first sentence starts playing       tts_end   last one done
+#
+#plus audio queue depth and decoder CPU time. Finished turns are appended to a
+#JSONL file and folded into Prometheus-style histograms written to a text file
+#(node_exporter textfile format). Per block the cost is a few counter updates,
+#so it stays on all the time. trace_summary.py reports p50/p95/p99 per span.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+STAGES = ("block_enqueue", "block_dequeue", "wake", "speech_start", "speech_end", "endpoint", "llm_request",
+          "llm_first_byte", "llm_done", "tts_start", "tts_end")
+
+# (span, from stage, to stage): the intervals worth looking at
+SPANS = (
+    ("queue_wait", "block_enqueue", "block_dequeue"),
+    ("wake_latency", "block_enqueue", "wake"),
+    ("utterance", "wake", "endpoint"),
+    ("endpoint_delay", "speech_end", "endpoint"),
+    ("llm_first_byte", "llm_request", "llm_first_byte"),
+    ("llm_total", "llm_request", "llm_done"),
+    ("endpoint_to_first_byte", "endpoint", "llm_first_byte"),
+    ("endpoint_to_speech", "endpoint", "tts_start"),
+    ("speech", "tts_start", "tts_end"),
+    ("turn", "wake", "tts_end"),
+)
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class TurnTrace:
+    __slots__ = ("id", "source", "marks", "decoder_cpu", "queue_depth_max", "cancelled")
+
+    def __init__(self, id, source):
+        self.id = id
+        self.source = source
+        self.marks = {}
+        self.decoder_cpu = 0.0
+        self.queue_depth_max = 0
+        self.cancelled = False
+
+    def mark(self, stage, t=None):
+        self.marks[stage] = time.perf_counter() if t is None else t
+
+    def mark_once(self, stage, t=None):
+        if stage not in self.marks:
+            self.mark(stage, t)
+
+    def spans(self):
+        marks = self.marks
+        return {name: marks[b] - marks[a] for name, a, b in SPANS if a in marks and b in marks}
+
+    def record(self):
+        t0 = min(self.marks.values()) if self.marks else 0.0
+        return {
+            "turn": self.id,
+            "source": self.source,
+            "cancelled": self.cancelled,
+            "marks_ms": {stage: round((self.marks[stage] - t0) * 1000, 3)
+                         for stage in STAGES if stage in self.marks},
+            "spans_ms": {name: round(seconds * 1000, 3) for name, seconds in self.spans().items()},
+            "decoder_cpu_ms": round(self.decoder_cpu * 1000, 3),
+            "queue_depth_max": self.queue_depth_max,
+        }
+
+
+def traced_stream(chunks, marks):
+    # marks llm_request/llm_first_byte/llm_done into a plain dict as the stream is read
+    marks["llm_request"] = time.perf_counter()
+    for chunk in chunks:
+        if "llm_first_byte" not in marks:
+            marks["llm_first_byte"] = time.perf_counter()
+        yield chunk
+    marks["llm_done"] = time.perf_counter()
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class Tracer:
+    def __init__(self, path=None, metrics_path=None, keep=200):
+        self.path = path
+        self.metrics_path = metrics_path
+        self.recent = deque(maxlen=keep)
+        self.started = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self.histograms = {name: Histogram() for name, _, _ in SPANS}
+        self.turns = 0
+        self.cancelled = 0
+        self.blocks = 0
+        self.decoder_cpu = 0.0
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        self.queue_wait = 0.0
+
+    def begin(self, source):
+        with self._lock:
+            self.started += 1
+            return TurnTrace(self.started, source)
+
+    def block(self, enqueued, dequeued, depth, turn=None):
+        # once per decoded block, from the recorder thread only
+        self.blocks += 1
+        self.queue_wait += dequeued - enqueued
+        self.queue_depth = depth
+        if depth > self.queue_depth_max:
+            self.queue_depth_max = depth
+        if turn is not None and depth > turn.queue_depth_max:
+            turn.queue_depth_max = depth
+
+    def decoder(self, cpu_seconds, turn=None):
+        self.decoder_cpu += cpu_seconds
+        if turn is not None:
+            turn.decoder_cpu += cpu_seconds
+
+    def end(self, turn):
+        if turn is None:
+            return
+        record = turn.record()
+        with self._lock:
+            self.turns += 1
+            self.cancelled += turn.cancelled
+            if not turn.cancelled:
+                for name, seconds in turn.spans().items():
+                    self.histograms[name].observe(seconds)
+            self.recent.append(record)
+            if self.path:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "a", buffering=1)
+                self._file.write(json.dumps(record) + "\n")
+        if self.metrics_path:
+            self.write_metrics()
+
+    def prometheus(self):
+        lines = [
+            "# HELP vox_turn_stage_seconds Time between two stages of a turn.",
+            "# TYPE vox_turn_stage_seconds histogram",
+        ]
+        with self._lock:
+            for name, hist in self.histograms.items():
+                cumulative = 0
+                for bound, count in zip(BUCKETS, hist.counts):
+                    cumulative += count
+                    lines.append(f'vox_turn_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'vox_turn_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'vox_turn_stage_seconds_sum{{stage="{name}"}} {hist.sum:.6f}')
+                lines.append(f'vox_turn_stage_seconds_count{{stage="{name}"}} {hist.count}')
+            lines += [
+                "# TYPE vox_turns_total counter", f"vox_turns_total {self.turns}",
+                "# TYPE vox_turns_cancelled_total counter", f"vox_turns_cancelled_total {self.cancelled}",
+                "# TYPE vox_audio_blocks_total counter", f"vox_audio_blocks_total {self.blocks}",
+                "# TYPE vox_audio_queue_wait_seconds_total counter",
+                f"vox_audio_queue_wait_seconds_total {self.queue_wait:.6f}",
+                "# TYPE vox_audio_queue_depth_bytes gauge", f"vox_audio_queue_depth_bytes {self.queue_depth}",
+                "# TYPE vox_audio_queue_depth_max_bytes gauge",
+                f"vox_audio_queue_depth_max_bytes {self.queue_depth_max}",
+                "# TYPE vox_decoder_cpu_seconds_total counter",
+                f"vox_decoder_cpu_seconds_total {self.decoder_cpu:.6f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self):
+        os.makedirs(os.path.dirname(self.metrics_path) or ".", exist_ok=True)
+        tmp = self.metrics_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, self.metrics_path)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,116 @@
+#TTS CACHE
+#Renders text to WAV once with engine.save_to_file and plays the file straight
+#to the audio device afterwards. Files are keyed on voice, rate and text, fixed
+#phrases can be rendered ahead of time and kept decoded in memory.
+
+import hashlib
+import os
+import threading
+import wave
+import numpy as np
+
+
+class TTSCache:
+    def __init__(self, engine, directory="cache/tts", max_files=300, device=None):
+        self.engine = engine
+        self.directory = directory
+        self.max_files = max_files
+        self.device = device
+        self.hits = 0
+        self.misses = 0
+        # pyttsx3 engines are not reentrant, every use of the engine goes through this lock
+        self.engine_lock = threading.Lock()
+        self._pinned = {}
+        self._stops = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, text):
+        voice = self.engine.getProperty('voice')
+        rate = self.engine.getProperty('rate')
+        return hashlib.sha1(f"{voice}\0{rate}\0{text}".encode("utf-8")).hexdigest()
+
+    def path_for(self, text):
+        return os.path.join(self.directory, self.key(text) + ".wav")
+
+    def render(self, text):
+        # None if stop() cut the render short, a partial file must not be cached
+        path = self.path_for(text)
+        if os.path.exists(path):
+            return path
+        # not .wav, so _trim() never sees a file that is still being written
+        tmp = f"{path}.{threading.get_ident()}.part"
+        with self.engine_lock:
+            stops = self._stops
+            self.engine.save_to_file(text, tmp)
+            self.engine.runAndWait()
+            interrupted = self._stops != stops
+        if interrupted:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+        os.replace(tmp, path)
+        self._trim()
+        return path
+
+    def stop(self):
+        # barge-in: ends playback, and a render in progress is kept out of the cache
+        import sounddevice as sd
+        sd.stop()
+        self._stops += 1
+        self.engine.stop()
+
+    def _trim(self):
+        files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".wav")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            if path not in self._pinned:
+                os.remove(path)
+
+    def _load(self, path):
+        with wave.open(path, "rb") as wf:
+            channels = wf.getnchannels()
+            rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        return samples.reshape(-1, channels), rate
+
+    def prerender(self, phrases):
+        # renders and pins fixed phrases on a background thread so startup isn't held up
+        def work():
+            for text in phrases:
+                try:
+                    path = self.render(text)
+                    if path is not None:
+                        self._pinned[path] = self._load(path)
+                except Exception as e:
+                    print(f"TTS prerender error: {e}")
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        return thread
+
+    def play(self, text, volume=1.0):
+        path = self.path_for(text)
+        audio = self._pinned.get(path)
+        if audio is None:
+            if os.path.exists(path):
+                self.hits += 1
+                os.utime(path)
+            else:
+                self.misses += 1
+                path = self.render(text)
+                if path is None:
+                    return
+            audio = self._load(path)
+        else:
+            self.hits += 1
+        samples, rate = audio
+        if volume != 1.0:
+            samples = (samples * volume).astype(np.int16)
+        # imported here so the cache loads on machines without PortAudio (bench_replay)
+        import sounddevice as sd
+        sd.play(samples, rate, device=self.device)
+        sd.wait()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "pinned": len(self._pinned)}
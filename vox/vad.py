@@ -0,0 +1,131 @@
+#VOICE ACTIVITY DETECTION
+#Sits between the audio ring and the recognizer so silence is never decoded.
+#Every block is split into 10 ms frames and classified in one vectorized pass:
+#a frame is speech when its RMS is over the threshold, or when it is somewhat
+#quieter but has the high zero-crossing rate of unvoiced consonants (s, f, th).
+#The threshold follows the background noise floor. With webrtcvad installed
+#its classifier is used instead.
+#
+#process() returns the audio worth decoding plus an utterance boundary:
+#a short pre-roll is released when speech starts so onsets aren't clipped,
+#and a hangover keeps word endings until the utterance is declared over.
+
+from collections import deque
+import numpy as np
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+SPEECH_START = "speech_start"
+SPEECH_END = "speech_end"
+
+
+class VoiceActivityDetector:
+    def __init__(self, samplerate=16000, threshold=400, zcr_unvoiced=0.25, min_voiced=0.2,
+                 preroll_ms=300, hangover_ms=300, noise_ratio=3.0, aggressiveness=2, use_webrtc=None):
+        self.samplerate = samplerate
+        self.hop = samplerate // 100  # 10 ms frames
+        self.threshold = threshold    # RMS floor on the int16 scale, raised when the room is noisy
+        self.zcr_unvoiced = zcr_unvoiced
+        self.min_voiced = min_voiced  # fraction of 10 ms frames that must be speech for the block to be
+        self.preroll_ms = preroll_ms
+        self.hangover_ms = hangover_ms
+        self.noise_ratio = noise_ratio
+        self.noise_floor = 0.0
+        if use_webrtc is None:
+            use_webrtc = webrtcvad is not None and samplerate in (8000, 16000, 32000, 48000)
+        self.webrtc = webrtcvad.Vad(aggressiveness) if use_webrtc else None
+        self.reset()
+        self.blocks = 0
+        self.speech_blocks = 0
+        self.utterances = 0
+
+    def reset(self):
+        self.in_speech = False
+        self._preroll = deque()
+        self._preroll_bytes = 0
+        self._hang = 0.0
+        self._gate_hang = 0.0
+
+    def frames(self, data):
+        # per 10 ms frame speech flags, remainder samples are ignored
+        samples = np.frombuffer(data, dtype=np.int16)
+        n = samples.size // self.hop
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        if self.webrtc is not None:
+            raw = memoryview(data).cast("B")
+            step = self.hop * 2
+            return np.fromiter((self.webrtc.is_speech(bytes(raw[i * step:(i + 1) * step]), self.samplerate)
+                                for i in range(n)), dtype=bool, count=n)
+        frames = samples[:n * self.hop].reshape(n, self.hop).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.hop
+        threshold = max(self.threshold, self.noise_floor * self.noise_ratio)
+        voiced = (rms >= threshold) | ((rms >= threshold * 0.5) & (zcr >= self.zcr_unvoiced))
+        quiet = rms[~voiced]
+        if quiet.size:
+            # slow EWMA of the background level so a fan or traffic doesn't count as speech
+            level = float(np.median(quiet))
+            self.noise_floor = level if self.noise_floor == 0.0 else 0.95 * self.noise_floor + 0.05 * level
+        return voiced
+
+    def is_voiced(self, data):
+        flags = self.frames(data)
+        return flags.size > 0 and np.count_nonzero(flags) >= self.min_voiced * flags.size
+
+    def is_speech(self, data):
+        # drop-in for EnergyGate.is_speech (wake word gate): voiced or within the hangover
+        if self.is_voiced(data):
+            self._gate_hang = self.hangover_ms
+            return True
+        if self._gate_hang > 0:
+            self._gate_hang -= len(data) / 2 / self.samplerate * 1000
+            return True
+        return False
+
+    def process(self, data):
+        # returns ([blocks to decode], SPEECH_START / SPEECH_END / None)
+        self.blocks += 1
+        block_ms = len(data) / 2 / self.samplerate * 1000
+        if self.is_voiced(data):
+            self.speech_blocks += 1
+            self._hang = self.hangover_ms
+            if not self.in_speech:
+                self.in_speech = True
+                self.utterances += 1
+                out = list(self._preroll) + [data]
+                self._preroll.clear()
+                self._preroll_bytes = 0
+                return out, SPEECH_START
+            return [data], None
+        if self.in_speech:
+            if self._hang > 0:
+                self._hang -= block_ms
+                self.speech_blocks += 1
+                return [data], None
+            self.in_speech = False
+            self._keep(data)
+            return [], SPEECH_END
+        self._keep(data)
+        return [], None
+
+    def _keep(self, data):
+        self._preroll.append(bytes(data))
+        self._preroll_bytes += len(data)
+        limit = self.samplerate * 2 * self.preroll_ms // 1000
+        while self._preroll and self._preroll_bytes - len(self._preroll[0]) >= limit:
+            self._preroll_bytes -= len(self._preroll.popleft())
+
+    def stats(self):
+        return {
+            "blocks": self.blocks,
+            "speech_blocks": self.speech_blocks,
+            "skipped": 1 - self.speech_blocks / self.blocks if self.blocks else 0.0,
+            "utterances": self.utterances,
+            "noise_floor": round(self.noise_floor, 1),
+            "webrtc": self.webrtc is not None,
+        }
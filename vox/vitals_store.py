@@ -0,0 +1,248 @@
+#VITALS STORE
+#Bounded time series for readings like pulse, shared by the watch UI (which
+#writes) and the voice assistant (which reads, from another process).
+#
+#Each series is a directory of append-only segment files of fixed-size
+#binary records (epoch seconds, value). A full segment is closed and a new
+#one started; past max_segments the oldest is deleted, so disk use is
+#bounded. Reads memory-map the segments and binary search on time, so the
+#latest readings and any time range cost the same after a day or a year.
+#Per-minute and per-hour min/max/sum/count rollups are written alongside
+#the raw readings as each bucket closes, which keeps "today" or "this week"
+#aggregates small. The writer also keeps the most recent readings in a
+#numpy ring buffer.
+#
+#   store = VitalsStore("cache/vitals", "pulse")
+#   store.append(72)
+#   store.tail(10)                       # records with fields t, v
+#   store.aggregate(t0, t1, "minute")    # records with fields t, min, max, sum, count
+
+import os
+import time
+import numpy as np
+
+VITALS_PATH = "cache/vitals"
+
+RAW = np.dtype([("t", "<f8"), ("v", "<f4")])
+ROLLUP = np.dtype([("t", "<f8"), ("min", "<f4"), ("max", "<f4"), ("sum", "<f8"), ("count", "<u4")])
+LEVELS = {"minute": 60, "hour": 3600}
+
+# (records per segment, segments kept) for raw readings and each rollup level
+RETENTION = {
+    "raw": (86400, 30),       # a reading every 3 s fills a segment in three days
+    "minute": (10080, 52),    # a week per segment, a year kept
+    "hour": (8760, 10),       # a year per segment
+}
+
+
+def rollup(records, seconds):
+    # raw records sorted by time -> one ROLLUP record per bucket that has readings
+    if not records.size:
+        return np.zeros(0, dtype=ROLLUP)
+    starts = records["t"] - records["t"] % seconds
+    index = np.r_[0, np.flatnonzero(np.diff(starts)) + 1]
+    values = records["v"].astype(np.float64)
+    out = np.zeros(index.size, dtype=ROLLUP)
+    out["t"] = starts[index]
+    out["min"] = np.minimum.reduceat(values, index)
+    out["max"] = np.maximum.reduceat(values, index)
+    out["sum"] = np.add.reduceat(values, index)
+    out["count"] = np.diff(np.r_[index, values.size])
+    return out
+
+
+class SegmentLog:
+    def __init__(self, path, dtype, segment_records, max_segments, writable=True):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.writable = writable
+        self._file = None
+        self._count = 0
+        if writable:
+            os.makedirs(path, exist_ok=True)
+            self._reopen()
+
+    def segments(self):
+        try:
+            names = sorted(n for n in os.listdir(self.path) if n.endswith(".seg"))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.path, n) for n in names]
+
+    def _reopen(self):
+        segments = self.segments()
+        if not segments:
+            return
+        # a crash can leave half a record at the end, cut it off
+        size = os.path.getsize(segments[-1])
+        with open(segments[-1], "r+b") as f:
+            f.truncate(size - size % self.dtype.itemsize)
+        self._count = size // self.dtype.itemsize
+        self._file = open(segments[-1], "ab")
+
+    def load(self, path):
+        count = os.path.getsize(path) // self.dtype.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(path, dtype=self.dtype, mode="r", shape=(count,))
+
+    def append(self, record):
+        if self._file is None or self._count >= self.segment_records:
+            self._roll(record[0])
+        self._file.write(np.array([record], dtype=self.dtype).tobytes())
+        self._file.flush()
+        self._count += 1
+
+    def _roll(self, t):
+        if self._file is not None:
+            self._file.close()
+        # named after the first record's time in ms, so names sort by time
+        self._file = open(os.path.join(self.path, f"{int(t * 1000):015d}.seg"), "ab")
+        self._count = 0
+        segments = self.segments()
+        for path in segments[:max(0, len(segments) - self.max_segments)]:
+            os.remove(path)
+
+    def range(self, t0, t1):
+        segments = self.segments()
+        starts = [int(os.path.basename(p)[:-4]) / 1000 for p in segments]
+        parts = []
+        for i, path in enumerate(segments):
+            if starts[i] > t1 or (i + 1 < len(segments) and starts[i + 1] < t0):
+                continue
+            records = self.load(path)
+            lo = np.searchsorted(records["t"], t0, "left")
+            hi = np.searchsorted(records["t"], t1, "right")
+            if hi > lo:
+                parts.append(np.array(records[lo:hi]))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=self.dtype)
+
+    def tail(self, n):
+        parts = []
+        for path in reversed(self.segments()):
+            if n <= 0:
+                break
+            records = self.load(path)
+            parts.append(np.array(records[-n:]) if records.size else records)
+            n -= records.size
+        return np.concatenate(parts[::-1]) if parts else np.zeros(0, dtype=self.dtype)
+
+    def size_bytes(self):
+        return sum(os.path.getsize(p) for p in self.segments())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class VitalsStore:
+    def __init__(self, root=VITALS_PATH, name="pulse", ring=4096, retention=RETENTION, writable=True):
+        self.name = name
+        self.writable = writable
+        path = os.path.join(root, name)
+        records, segments = retention["raw"]
+        self.raw = SegmentLog(os.path.join(path, "raw"), RAW, records, segments, writable)
+        self.levels = {}
+        for level in LEVELS:
+            records, segments = retention[level]
+            self.levels[level] = SegmentLog(os.path.join(path, level), ROLLUP, records, segments, writable)
+        self.appended = 0
+        self._last_t = float("-inf")
+        self._open = {}
+        self._ring = None
+        if writable:
+            # newest readings in memory, oldest overwritten first
+            self._ring = np.zeros(ring, dtype=RAW)
+            self._head = 0
+            self._filled = 0
+            recent = self.raw.tail(ring)
+            self._ring[:recent.size] = recent
+            self._head = recent.size % ring
+            self._filled = recent.size
+            if recent.size:
+                self._last_t = float(recent["t"][-1])
+            self._restore_open()
+
+    def _restore_open(self):
+        # readings after the last closed bucket: all but the newest bucket are closed now
+        for level, seconds in LEVELS.items():
+            log = self.levels[level]
+            last = log.tail(1)
+            since = float(last["t"][0]) + seconds if last.size else float("-inf")
+            buckets = rollup(self.raw.range(since, float("inf")), seconds)
+            for bucket in buckets[:-1]:
+                log.append(bucket.tolist())
+            self._open[level] = list(buckets[-1].tolist()) if buckets.size else None
+
+    def append(self, value, t=None):
+        # timestamps never go backwards, range reads binary search on them
+        t = max(time.time() if t is None else t, self._last_t)
+        self._last_t = t
+        self.raw.append((t, value))
+        self._ring[self._head] = (t, value)
+        self._head = (self._head + 1) % self._ring.size
+        self._filled = min(self._filled + 1, self._ring.size)
+        for level, seconds in LEVELS.items():
+            start = t - t % seconds
+            bucket = self._open.get(level)
+            if bucket is not None and bucket[0] != start:
+                self.levels[level].append(tuple(bucket))
+                bucket = None
+            if bucket is None:
+                self._open[level] = [start, value, value, float(value), 1]
+            else:
+                bucket[1] = min(bucket[1], value)
+                bucket[2] = max(bucket[2], value)
+                bucket[3] += value
+                bucket[4] += 1
+        self.appended += 1
+
+    def tail(self, n):
+        if self._ring is not None and n <= self._filled:
+            index = (self._head - n + np.arange(n)) % self._ring.size
+            return self._ring[index]
+        return self.raw.tail(n)
+
+    def latest(self):
+        records = self.tail(1)
+        return (float(records["t"][0]), float(records["v"][0])) if records.size else None
+
+    def range(self, t0, t1=None):
+        return self.raw.range(t0, time.time() if t1 is None else t1)
+
+    def aggregate(self, t0, t1=None, level="minute"):
+        # closed buckets from the rollup log, the still open one from raw readings
+        t1 = time.time() if t1 is None else t1
+        seconds = LEVELS[level]
+        log = self.levels[level]
+        start = t0 - t0 % seconds
+        closed = log.range(start, t1)
+        last = log.tail(1)
+        since = max(start, float(last["t"][0]) + seconds if last.size else start)
+        recent = rollup(self.raw.range(since, t1), seconds)
+        return np.concatenate([closed, recent])
+
+    def summary(self, t0, t1=None, level="minute"):
+        # (min, max, average, count) over the range, or None without readings
+        buckets = self.aggregate(t0, t1, level)
+        count = int(buckets["count"].sum())
+        if not count:
+            return None
+        return float(buckets["min"].min()), float(buckets["max"].max()), float(buckets["sum"].sum()) / count, count
+
+    def stats(self):
+        return {
+            "appended": self.appended,
+            "ring": self._filled if self._ring is not None else 0,
+            "segments": len(self.raw.segments()),
+            "bytes": self.raw.size_bytes() + sum(log.size_bytes() for log in self.levels.values()),
+        }
+
+    def close(self):
+        # the open buckets are rebuilt from raw readings on the next start
+        self.raw.close()
+        for log in self.levels.values():
+            log.close()
@@ -0,0 +1,263 @@
+#VOICE HUB
+#One process serving many microphones. Each kiosk opens a TCP connection,
+#sends one JSON header line and then streams raw int16 mono PCM:
+#
+#   {"session": "kiosk-1", "rate": 16000, "wake": false}\n<pcm bytes...>
+#
+#and gets JSON lines back: ready, wake, partial, final, reply (one per
+#sentence), reply_end, busy, bye, or error for a bad header. Every session
+#has its own recognizer and turn state, but all of them share one loaded
+#Vosk Model and one LLM router with pooled clients. Decoding runs on a
+#thread pool and at most max_sessions clients are admitted at a time.
+#Half-closing the socket ends the stream.
+#
+#   python vox/voice_hub.py --port 8765 --max-sessions 8
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from vosk import Model, KaldiRecognizer, SetLogLevel
+from endpoint import EndpointDetector, END
+from gemini_stream import SentenceSplitter
+from llm_client import AsyncLLMClient, LLMError, GEMINI_BASE_URL
+from wake_word import WakeWordDetector
+from conversation import ConversationStore, brief_summary
+from intents import local_intents
+from config import (MODEL_PATHS, LANGUAGE, HISTORY_CHARS, HISTORY_IDLE, gemini_request,
+                    prompt_chars, make_llm)
+from request_builder import API_KEY_ENV, API_KEY_FILE
+
+FRAME_MS = 100
+# sample rates a client may send, anything else is refused with an error event
+MIN_RATE = 8000
+MAX_RATE = 48000
+
+
+def parse_header(line):
+    # the client's first line; ValueError with a message the client gets back
+    try:
+        header = json.loads(line or b"{}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"header is not JSON: {e}")
+    if not isinstance(header, dict):
+        raise ValueError("header must be a JSON object")
+    rate = header.get("rate", 16000)
+    if isinstance(rate, bool) or not isinstance(rate, int) or not MIN_RATE <= rate <= MAX_RATE:
+        raise ValueError(f"rate must be a whole number of samples per second from {MIN_RATE} to {MAX_RATE}")
+    session = header.get("session")
+    if session is not None and not isinstance(session, str):
+        raise ValueError("session must be a string")
+    return session, rate, bool(header.get("wake"))
+
+
+class HubSession:
+    # per-connection decoder state; feed() runs on the decode pool, one call at a time
+    def __init__(self, name, model, rate, wake=False):
+        self.name = name
+        self.model = model
+        self.rate = rate
+        self.frame_bytes = rate * FRAME_MS // 1000 * 2
+        self.wake_detector = WakeWordDetector(model, rate) if wake else None
+        self.endpoint = EndpointDetector(rate)
+        self.recording = not wake
+        self.recognizer = KaldiRecognizer(model, rate) if self.recording else None
+        self.result_text = []
+        self.partial = ""
+
+    def _start(self):
+        self.recognizer = KaldiRecognizer(self.model, self.rate)
+        self.endpoint.reset()
+        self.result_text = []
+        self.partial = ""
+        self.recording = True
+
+    def _finish(self):
+        final = json.loads(self.recognizer.FinalResult())
+        if final.get("text"):
+            self.result_text.append(final["text"])
+        text = " ".join(self.result_text).strip()
+        if self.wake_detector is not None:
+            self.recording = False
+            self.wake_detector.reset()
+        else:
+            self._start()
+        return {"type": "final", "text": text}
+
+    def feed(self, data):
+        events = []
+        if not self.recording:
+            if self.wake_detector.accept(data):
+                self._start()
+                events.append({"type": "wake"})
+            return events
+
+        if self.recognizer.AcceptWaveform(data):
+            result = json.loads(self.recognizer.Result())
+            if result.get("text"):
+                self.result_text.append(result["text"])
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        transcript = " ".join(self.result_text + [partial]).strip()
+        if partial and partial != self.partial:
+            events.append({"type": "partial", "text": transcript})
+        self.partial = partial
+        if self.endpoint.update(data, transcript) == END:
+            events.append(self._finish())
+        return events
+
+    def close(self):
+        if self.recording and self.recognizer is not None:
+            return [self._finish()]
+        return []
+
+
+class VoiceHub:
+    def __init__(self, model, llm=None, max_sessions=8, decode_threads=None, admit_timeout=2.0):
+        self.model = model
+        self.llm = llm
+        self.max_sessions = max_sessions
+        self.admit_timeout = admit_timeout
+        self.decode_pool = ThreadPoolExecutor(max_workers=decode_threads or os.cpu_count() or 1,
+                                              thread_name_prefix="decode")
+        # kiosks reconnect per utterance, so history is keyed on the session name, not the socket
+        self.conversation = ConversationStore(max_chars=HISTORY_CHARS, idle_seconds=HISTORY_IDLE,
+                                              summarize=brief_summary)
+        # time, date and pulse never need the LLM; volume is a per-kiosk thing and stays off
+        self.intents = local_intents()
+        self._slots = asyncio.Semaphore(max_sessions)
+        self._ids = itertools.count(1)
+        self.active = 0
+        self.served = 0
+        self.rejected = 0
+
+    async def handle(self, reader, writer):
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.admit_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            await self._send(writer, {"type": "busy", "max_sessions": self.max_sessions})
+            writer.close()
+            return
+
+        self.active += 1
+        replies = set()
+        try:
+            try:
+                name, rate, wake = parse_header(await reader.readline())
+            except ValueError as e:
+                await self._send(writer, {"type": "error", "error": str(e)})
+                return
+            session = HubSession(name or f"session-{next(self._ids)}", self.model, rate, wake)
+            await self._send(writer, {"type": "ready", "session": session.name})
+            loop = asyncio.get_running_loop()
+            while True:
+                try:
+                    data = await reader.readexactly(session.frame_bytes)
+                except asyncio.IncompleteReadError as e:
+                    data = e.partial
+                if not data:
+                    break
+                events = await loop.run_in_executor(self.decode_pool, session.feed, data)
+                replies.update(await self._emit(writer, session.name, events))
+                if len(data) < session.frame_bytes:
+                    break
+            events = await loop.run_in_executor(self.decode_pool, session.close)
+            replies.update(await self._emit(writer, session.name, events))
+            if replies:
+                await asyncio.gather(*replies)
+            await self._send(writer, {"type": "bye"})
+        except ConnectionError as e:
+            print(f"Session error: {e}")
+        finally:
+            self.active -= 1
+            self.served += 1
+            self._slots.release()
+            writer.close()
+
+    async def _emit(self, writer, name, events):
+        tasks = []
+        for event in events:
+            await self._send(writer, event)
+            if event["type"] != "final" or not event["text"] or self.llm is None:
+                continue
+            local = self.intents.answer(event["text"])
+            if local is not None:
+                await self._send(writer, {"type": "reply", "text": local[1], "intent": local[0]})
+                await self._send(writer, {"type": "reply_end"})
+            else:
+                tasks.append(asyncio.create_task(self._reply(writer, name, event["text"])))
+        return tasks
+
+    async def _reply(self, writer, name, text):
+        splitter = SentenceSplitter()
+        summary, history = self.conversation.history(name)
+        data = gemini_request(text, history, summary)
+        self.conversation.record_prompt(prompt_chars(data))
+        sentences = []
+        try:
+            async for chunk in self.llm.stream(data):
+                for sentence in splitter.feed(chunk):
+                    sentences.append(sentence)
+                    await self._send(writer, {"type": "reply", "text": sentence})
+            for sentence in splitter.flush():
+                sentences.append(sentence)
+                await self._send(writer, {"type": "reply", "text": sentence})
+            self.conversation.add_turn(name, text, " ".join(sentences))
+        except LLMError as e:
+            await self._send(writer, {"type": "reply", "text": str(e), "error": True})
+        except ConnectionError:
+            return
+        except Exception as e:
+            await self._send(writer, {"type": "reply", "text": f"Exception while calling Gemini: {e}", "error": True})
+        await self._send(writer, {"type": "reply_end"})
+
+    async def _send(self, writer, event):
+        writer.write((json.dumps(event) + "\n").encode("utf-8"))
+        await writer.drain()
+
+    def stats(self):
+        stats = {"active": self.active, "served": self.served, "rejected": self.rejected,
+                 "max_sessions": self.max_sessions, "conversation": self.conversation.stats(),
+                 "intents": self.intents.stats()}
+        if self.llm is not None and hasattr(self.llm.client, "stats"):
+            stats["llm"] = self.llm.client.stats()
+        return stats
+
+
+async def serve(hub, host, port):
+    server = await asyncio.start_server(hub.handle, host, port)
+    print(f"Voice hub listening on {host}:{port}, up to {hub.max_sessions} sessions")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve many PCM clients from one Vosk model and LLM client")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=8)
+    parser.add_argument("--decode-threads", type=int, default=None)
+    parser.add_argument("--model", default=MODEL_PATHS[LANGUAGE])
+    parser.add_argument("--llm-url", default=GEMINI_BASE_URL, help="Gemini-compatible base URL")
+    parser.add_argument("--api-key", help=f"Gemini API key, defaults to ${API_KEY_ENV} or {API_KEY_FILE}")
+    parser.add_argument("--no-llm", action="store_true", help="only transcribe, never call the LLM")
+    args = parser.parse_args()
+
+    SetLogLevel(-1)
+    model = Model(args.model)
+    llm = None
+    if not args.no_llm:
+        llm = AsyncLLMClient(make_llm(gemini_url=args.llm_url, pool_size=args.max_sessions, api_key=args.api_key))
+    hub = VoiceHub(model, llm, args.max_sessions, args.decode_threads)
+    try:
+        asyncio.run(serve(hub, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"\nVoice hub stopped: {hub.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#WAKE WORD STAGE
+#Cheap always-on front end: an energy gate drops silent blocks and a
+#grammar-restricted Vosk recognizer only knows the wake word, so the full
+#large-vocabulary decoder is never fed while Aria is idle.
+
+import json
+import numpy as np
+from vosk import KaldiRecognizer
+
+WAKE_WORD = "aria"
+
+
+class EnergyGate:
+    def __init__(self, samplerate=16000, threshold=400, hangover_ms=1000):
+        # threshold is the RMS level (int16 scale) a block needs to count as speech,
+        # hangover keeps the gate open a little longer so word endings get through
+        self.samplerate = samplerate
+        self.threshold = threshold
+        self.hangover_ms = hangover_ms
+        self._hang = 0.0
+
+    def rms(self, data):
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return 0.0
+        return float(np.sqrt(np.mean(samples * samples)))
+
+    def is_speech(self, data):
+        if self.rms(data) >= self.threshold:
+            self._hang = self.hangover_ms
+            return True
+        if self._hang > 0:
+            self._hang -= len(data) / 2 / self.samplerate * 1000
+            return True
+        return False
+
+
+class WakeWordDetector:
+    def __init__(self, model, samplerate, wake_word=WAKE_WORD, gate=None):
+        self.wake_word = wake_word
+        self.gate = gate or EnergyGate(samplerate)
+        grammar = json.dumps([wake_word, "[unk]"])
+        self.recognizer = KaldiRecognizer(model, samplerate, grammar)
+        self._in_speech = False
+        self._preroll = None
+
+    def _heard(self, result_json):
+        words = json.loads(result_json)
+        text = words.get("text", words.get("partial", ""))
+        return self.wake_word in text.lower().split()
+
+    def accept(self, data):
+        # returns True once per wake word
+        if not self.gate.is_speech(data):
+            self._preroll = data
+            if self._in_speech:
+                # utterance ended inside the gate, flush whatever the decoder holds
+                self._in_speech = False
+                return self._heard(self.recognizer.FinalResult())
+            return False
+
+        if not self._in_speech and self._preroll is not None:
+            # feed the block before the gate opened so the word onset isn't clipped
+            self.recognizer.AcceptWaveform(self._preroll)
+        self._in_speech = True
+        self._preroll = None
+
+        if self.recognizer.AcceptWaveform(data):
+            return self._heard(self.recognizer.Result())
+        if self._heard(self.recognizer.PartialResult()):
+            self.reset()
+            return True
+        return False
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._in_speech = False
+        self._preroll = None